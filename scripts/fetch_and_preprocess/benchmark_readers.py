@@ -0,0 +1,78 @@
+#Script written by Aleksandr Schamberger (GitHub: https://github.com/a-leks-icon) as part of the introductory course by Roland Meyer 'Einführung in die Computerlinguistik (mit Anwendung auf Slawische Sprachen)' at the Humboldt Universität zu Berlin in the winter semester 2023/24.
+
+#Benchmark of the readers of the raw segments (see segment_readers.py) for every format of the DoReCo source files:
+#Throughput (files, megabytes and segments per second) per format and a check whether every format yields the same segments.
+
+import glob
+import json
+import os
+import statistics
+import time
+from segment_readers import FORMAT_READERS
+from urum_extraction import read_segments
+
+def benchmark_format(files:list[str],read,warmup:int=1,repeats:int=5) -> tuple[dict,list]:
+    '''Benchmarks reading the raw segments of source files of one format.
+
+    Reads all **files** with **read** **warmup** times without measuring and **repeats** times measuring the time.
+
+    Args:
+        files: List with the paths to the source files.
+        read: Function reading the raw segments of a file (see **FORMAT_READERS**).
+        warmup: Integer representing the number of runs before measuring.
+        repeats: Integer representing the number of measured runs.
+
+    Returns:
+        Tuple with two elements: a dictionary with the number of files, megabytes and segments, the median time in seconds and the throughput in files, megabytes and segments per second (*files_per_sec*, *mb_per_sec*, *segments_per_sec*), and a list with the segments of every file.
+    '''
+    times = []
+    for run in range(warmup+repeats):
+        start = time.perf_counter_ns()
+        segments = [read(file) for file in files]
+        if run >= warmup:
+            times.append((time.perf_counter_ns()-start)/1e9)
+    median_time = statistics.median(times)
+    mb = sum([os.path.getsize(file) for file in files])/2**20
+    segments_num = sum([len(file_segments) for file_segments in segments if file_segments is not None])
+    return {"files": len(files),
+            "mb": mb,
+            "segments": segments_num,
+            "sec": median_time,
+            "files_per_sec": len(files)/median_time,
+            "mb_per_sec": mb/median_time,
+            "segments_per_sec": segments_num/median_time},segments
+
+#START OPERATIONS#
+
+if __name__ == "__main__":
+    #Path of the Urum source files.
+    source_path = "../../data/source/doreco_urum1249_extended/"
+    #Number of runs before measuring and number of measured runs per format.
+    warmup = 1
+    repeats = 5
+    #Path of the .json-file with the results of this benchmark (None for not saving them).
+    results_path = "../../results/benchmark_readers.json"
+
+    #Recordings available in every format.
+    stems = sorted([file.removesuffix(".eaf") for file in glob.glob(source_path+"/*.eaf")])
+    stems = [stem for stem in stems if all([os.path.exists(stem+ext) for ext in FORMAT_READERS])]
+    readers = {"eaf (corflow)": (".eaf",read_segments)} | {ext.lstrip("."):(ext,read) for ext,read in FORMAT_READERS.items()}
+    results = {}
+    reference = None
+    for name,(ext,read) in readers.items():
+        print(f"Benchmarking format: {name}")
+        results[name],segments = benchmark_format([stem+ext for stem in stems],read,warmup,repeats)
+        #Compare the segments with the ones of corflow.
+        reference = segments if reference is None else reference
+        results[name]["same_segments"] = segments == reference
+        result = results[name]
+        print(f"{result['files_per_sec']:.1f} files/s. {result['mb_per_sec']:.1f} MB/s. {result['segments_per_sec']:.0f} segments/s. Same segments as corflow: {result['same_segments']}.")
+
+    #The files of every format contain the same recordings, so the fastest format takes the least time.
+    fastest = min([name for name in results if results[name]["same_segments"]],key=lambda name: results[name]["sec"])
+    print(f"Fastest format with the same segments: {fastest}")
+
+    if results_path:
+        print(f"Saving results: {results_path}")
+        with open(results_path,"w",encoding="utf-8") as file:
+            json.dump(results,file,indent=2)
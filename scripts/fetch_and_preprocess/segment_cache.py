@@ -0,0 +1,106 @@
+#Script written by Aleksandr Schamberger (GitHub: https://github.com/a-leks-icon) as part of the introductory course by Roland Meyer 'Einführung in die Computerlinguistik (mit Anwendung auf Slawische Sprachen)' at the Humboldt Universität zu Berlin in the winter semester 2023/24.
+
+#Caching the raw segments extracted from a source file (see urum_extraction.py), so that only new or changed files are parsed again.
+
+import hashlib
+import json
+import os
+import numpy as np
+
+#Name and version of the file format. Increase the version whenever the content of a file changes.
+FORMAT_NAME = "segment-cache"
+FORMAT_VERSION = 1
+#Separator of the strings in a cache file (it does not occur in the annotations).
+SEPARATOR = "\x00"
+
+def get_file_hash(file_path:str) -> str:
+    '''Returns the hexadecimal hash (blake2b) of the content of the file **file_path**.'''
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path,"rb") as file:
+        while chunk := file.read(2**20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def encode_strings(strings:list[str]) -> np.ndarray:
+    '''Returns the strings **strings** joined by **SEPARATOR** as an array of UTF-8 bytes.'''
+    return np.frombuffer(SEPARATOR.join(strings).encode("utf-8"),dtype=np.uint8)
+
+def decode_strings(array:np.ndarray,strings_num:int) -> list[str]:
+    '''Returns the **strings_num** strings encoded in **array** (see `encode_strings`).'''
+    return array.tobytes().decode("utf-8").split(SEPARATOR) if strings_num else []
+
+class SegmentCache:
+    '''Cache of the raw segments of source files.
+
+    Every source file gets a compressed .npz-file in the cache directory named after the source file. It contains the indices of the reference and word segment of every segment as arrays of integers, the strings of the words (once per word), morphs and pos tags as arrays of UTF-8 bytes and a JSON header with the format version, the version of the extractor and the hash of the content of the source file. An entry is only used, if both the hash and the version of the extractor match, so changed source files and changes to the extractor lead to parsing the file again.
+
+    Attributes:
+        cache_dir: Path to the cache directory.
+        version: Integer or string representing the version of the extractor.
+        hits: Integer representing the number of files read from the cache.
+        misses: Integer representing the number of files extracted again.
+    '''
+
+    def __init__(self,cache_dir:str,version:int|str):
+        '''Creates a cache in the directory **cache_dir** (created, if it does not exist) for segments extracted by the extractor version **version**.'''
+        self.cache_dir = cache_dir
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir,exist_ok=True)
+
+    def get_path(self,source_path:str) -> str:
+        '''Returns the path of the cache file of the source file **source_path**.'''
+        return os.path.join(self.cache_dir,os.path.basename(source_path)+".npz")
+
+    def load(self,source_path:str,source_hash:str) -> list[tuple[int,int,str,str,str]]|None:
+        '''Returns the cached segments of the source file **source_path** with the hash **source_hash** or None, if they are not in the cache or outdated.'''
+        try:
+            with np.load(self.get_path(source_path)) as arrays:
+                header = json.loads(arrays["header"].tobytes().decode("utf-8"))
+                if (header.get("format"),header.get("version"),header.get("extractor_version"),header.get("source_hash")) != (FORMAT_NAME,FORMAT_VERSION,self.version,source_hash):
+                    return None
+                ref_inds = arrays["ref_inds"].tolist()
+                word_inds = arrays["word_inds"].tolist()
+                words = decode_strings(arrays["words"],header["words_num"])
+                morphs = decode_strings(arrays["morphs"],len(ref_inds))
+                pos_tags = decode_strings(arrays["pos"],len(ref_inds))
+        except (OSError,ValueError,KeyError):
+            return None
+        #Map the index of every word segment to its string.
+        words = dict(zip(dict.fromkeys(word_inds),words))
+        return [(ref_ind,word_ind,words[word_ind],morph,pos) for ref_ind,word_ind,morph,pos in zip(ref_inds,word_inds,morphs,pos_tags)]
+
+    def save(self,source_path:str,source_hash:str,segments:list[tuple[int,int,str,str,str]]):
+        '''Saves the segments **segments** of the source file **source_path** with the hash **source_hash**.'''
+        words = {word_ind:word for ref_ind,word_ind,word,morph,pos in segments}
+        header = {"format": FORMAT_NAME,
+                  "version": FORMAT_VERSION,
+                  "extractor_version": self.version,
+                  "source": os.path.basename(source_path),
+                  "source_hash": source_hash,
+                  "words_num": len(words)}
+        header = np.frombuffer(json.dumps(header,ensure_ascii=False).encode("utf-8"),dtype=np.uint8)
+        #Write to a temporary file first, so that parallel or interrupted runs never leave a broken cache file.
+        cache_path = self.get_path(source_path)
+        with open(cache_path+".tmp","wb") as file:
+            np.savez_compressed(file,
+                                header=header,
+                                ref_inds=np.array([segment[0] for segment in segments],dtype=np.int32),
+                                word_inds=np.array([segment[1] for segment in segments],dtype=np.int32),
+                                words=encode_strings(list(words.values())),
+                                morphs=encode_strings([segment[3] for segment in segments]),
+                                pos=encode_strings([segment[4] for segment in segments]))
+        os.replace(cache_path+".tmp",cache_path)
+
+    def get(self,source_path:str,extract) -> list[tuple[int,int,str,str,str]]:
+        '''Returns the segments of the source file **source_path** from the cache or, if they are not in the cache or outdated, extracts them by calling **extract** with **source_path** and saves them.'''
+        source_hash = get_file_hash(source_path)
+        segments = self.load(source_path,source_hash)
+        if segments is not None:
+            self.hits += 1
+            return segments
+        self.misses += 1
+        segments = extract(source_path)
+        self.save(source_path,source_hash,segments)
+        return segments
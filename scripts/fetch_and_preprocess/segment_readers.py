@@ -0,0 +1,316 @@
+#Script written by Aleksandr Schamberger (GitHub: https://github.com/a-leks-icon) as part of the introductory course by Roland Meyer 'Einführung in die Computerlinguistik (mit Anwendung auf Slawische Sprachen)' at the Humboldt Universität zu Berlin in the winter semester 2023/24.
+
+#Reading the raw segments (ref, wd, word, morph, pos) of DoReCo source files (see `read_segments` in urum_extraction.py)
+#in the .eaf-, TextGrid- and XML-format without building a full transcription object with corflow.
+
+import html
+import re
+import xml.etree.ElementTree as ETree
+
+def get_parent_segment(tcode:float,starts:list[float],ends:list[float]) -> int|None:
+    '''Returns the index of the segment containing the time code **tcode** given the start and end times **starts** and **ends** of the segments of a tier, or None, if no segment contains it.
+
+    Follows the interpolation search of `getTime` in corflow step by step (including its results for overlapping segments), so that the segments get the same parents as with `fromElan`.
+    '''
+    if not starts:
+        return None
+    i_start = 0
+    i_end = len(starts)-1
+    i_check = -1
+    f_start = starts[0]
+    f_end = ends[-1]
+    if f_start == f_end and tcode == f_end:
+        return 0
+    elif tcode < f_start or tcode >= f_end:
+        return None
+    while not i_start == i_end:
+        if tcode < f_start or tcode >= f_end:
+            return None
+        i_check = i_start+int((i_end-i_start)*((tcode-f_start)/(f_end-f_start)))
+        if tcode >= starts[i_check] and (tcode < ends[i_check] or (tcode == ends[i_check] and ends[i_check] == starts[i_check])):
+            return i_check
+        elif tcode < starts[i_check]:
+            if i_check-1 >= i_start:
+                i_end = i_check-1
+                i_check = i_end
+                f_end = ends[i_end]
+        elif tcode >= ends[i_check]:
+            if i_check+1 <= i_end:
+                i_start = i_check+1
+                i_check = i_start
+                f_start = starts[i_start]
+    if tcode >= starts[i_check] and tcode < ends[i_check]:
+        return i_check%len(starts)
+    return None
+
+def get_children(parent_tier:dict,child_tier:dict) -> dict[str,list]:
+    '''Maps the ID of every segment of the tier **parent_tier** to the list of its child segments on the tier **child_tier** (see `read_eaf_tiers`) in the order of **child_tier**.'''
+    starts = [start for _,start,_,_ in parent_tier["aligned"]]
+    ends = [end for _,_,end,_ in parent_tier["aligned"]]
+    parent_ids = {anno[0] for anno in parent_tier["aligned"]+parent_tier["refs"]}
+    child_segs = {}
+    for anno in child_tier["aligned"]:
+        ind = get_parent_segment(anno[1],starts,ends)
+        if ind is not None:
+            child_segs.setdefault(parent_tier["aligned"][ind][0],[]).append(anno)
+    for anno in child_tier["refs"]:
+        if anno[1] in parent_ids:
+            child_segs.setdefault(anno[1],[]).append(anno)
+    return child_segs
+
+def add_tier(name:str,parent:str|None,tiers:list,kept_tiers:dict,wd_parents:set) -> dict|None:
+    '''Adds the tier **name** with the parent tier **parent** to **tiers** and returns the dictionary to collect its annotations (see `read_eaf_tiers`), if it is kept, or else None.
+
+    Tiers whose name contains *ref@*, starts with *wd@* or *ps@* and the first child tier of every *wd@* tier (the morph break tier) are kept. **wd_parents** collects the *wd@* tiers, whose first child tier was found.
+    '''
+    tiers.append((name,parent))
+    keep = (re.search("ref@",name) is not None) | name.startswith("wd@") | name.startswith("ps@")
+    if (parent is not None) and parent.startswith("wd@") and (parent not in wd_parents):
+        wd_parents.add(parent)
+        keep = True
+    if not keep:
+        return None
+    kept_tiers[name] = {"aligned": [],"refs": []}
+    return kept_tiers[name]
+
+def read_eaf_tiers(file:str) -> tuple[list[tuple[str,str|None]],dict[str,dict]]:
+    '''Streams an .eaf-file and keeps the annotations of the tiers needed for the segments only.
+
+    Parses **file** with `ETree.iterparse` and frees every annotation and tier element once it is read. Only the annotations of the tiers needed for the segments are kept (see `add_tier`).
+
+    Args:
+        file: Path to the .eaf-file.
+
+    Returns:
+        Tuple with two elements: a list with the name and the parent name (or None) of every tier in the order of the file, and a dictionary mapping the name of every kept tier to a dictionary with its time-aligned annotations (*aligned*: list of tuples of ID, start and end time in seconds and content, or None for the times, if a time slot has no value) and its referring annotations (*refs*: list of tuples of ID, the ID of the referred annotation and content).
+    '''
+    times = {}
+    tiers = []
+    kept_tiers = {}
+    #Parents of wd@ tiers, whose first child tier was found.
+    wd_parents = set()
+    tier = None
+    depth = 0
+    context = ETree.iterparse(file,events=("start","end"))
+    _,root = next(context)
+    for event,elem in context:
+        if event == "start":
+            depth += 1
+            if elem.tag == "TIER":
+                name = html.unescape(elem.get("TIER_ID","tier"))
+                parent = elem.get("PARENT_REF")
+                tier = add_tier(name,parent,tiers,kept_tiers,wd_parents)
+            continue
+        depth -= 1
+        if elem.tag == "TIME_SLOT":
+            value = elem.get("TIME_VALUE")
+            #Time codes in seconds (like in corflow).
+            times[elem.get("TIME_SLOT_ID")] = None if value is None else int(value)/1000
+        elif elem.tag == "ANNOTATION":
+            if tier is not None:
+                for anno in elem:
+                    value = anno.find("ANNOTATION_VALUE")
+                    content = html.unescape(value.text) if (value is not None) and value.text else ""
+                    anno_id = html.unescape(anno.get("ANNOTATION_ID",""))
+                    if anno.tag == "ALIGNABLE_ANNOTATION":
+                        tier["aligned"].append((anno_id,times.get(anno.get("TIME_SLOT_REF1")),times.get(anno.get("TIME_SLOT_REF2")),content))
+                    elif anno.tag == "REF_ANNOTATION":
+                        tier["refs"].append((anno_id,anno.get("ANNOTATION_REF"),content))
+            elem.clear()
+        if depth == 0:
+            #Free every element below the root once it is read.
+            tier = None
+            root.remove(elem)
+    return tiers,kept_tiers
+
+def get_tier_segments(tiers:list[tuple[str,str|None]],kept_tiers:dict[str,dict]) -> list[tuple[int,int,str,str,str]]|None:
+    '''Returns the raw segments of the tiers of a source file.
+
+    Chooses the ref@, wd@, morph break and ps@ tier like `get_tiers` in urum_extraction.py. Time-aligned segments get their parents from their start time on the parent tier, referring segments from the IDs of the annotations they refer to.
+
+    Args:
+        tiers: List with the name and the parent name (or None) of every tier in the order of the file.
+        kept_tiers: Dictionary mapping the name of every tier needed for the segments to its annotations (see `read_eaf_tiers`).
+
+    Returns:
+        List with the segments (see `read_segments` in urum_extraction.py), or None, if the tiers use features not supported (time codes without a value or time-aligned segments on a tier whose parent tier has referring annotations).
+    '''
+    children = {}
+    for name,parent in tiers:
+        children.setdefault(parent,[]).append(name)
+    #Get the reference tier and its respective word, morph break and and pos tier (see `get_tiers` in urum_extraction.py).
+    for ref_name in [name for name,parent in tiers if re.search("ref@",name)]:
+        for ch_name in children.get(ref_name,[]):
+            if ch_name.startswith("wd@"):
+                wd_name = ch_name
+                break
+        mb_name = children[wd_name][0]
+        for ch_name in children.get(mb_name,[]):
+            if ch_name.startswith("ps@"):
+                pos_name = ch_name
+                break
+    ref_tier,wd_tier,mb_tier,pos_tier = [kept_tiers[name] for name in (ref_name,wd_name,mb_name,pos_name)]
+    for tier in (ref_tier,wd_tier,mb_tier,pos_tier):
+        if any([start is None or end is None for _,start,end,_ in tier["aligned"]]):
+            return None
+    #Time-aligned segments can only get their parents from the time codes of a time-aligned parent tier.
+    for parent_tier,child_tier in ((ref_tier,wd_tier),(wd_tier,mb_tier),(mb_tier,pos_tier)):
+        if parent_tier["refs"] and child_tier["aligned"]:
+            return None
+    #Word segments belong to the reference tier only, if it is the parent tier of the word tier. If the last ref@ tier has no wd@ tier,
+    #the word tier is still the one of an earlier ref@ tier (like in `get_tiers`), so no word segment belongs to the chosen reference tier.
+    if dict(tiers).get(wd_name) != ref_name:
+        return []
+    wd_segs = get_children(ref_tier,wd_tier)
+    mb_segs = get_children(wd_tier,mb_tier)
+    pos_segs = get_children(mb_tier,pos_tier)
+    segments = []
+    wd_ind = 0
+    for ref_ind,ref_anno in enumerate(ref_tier["aligned"]+ref_tier["refs"]):
+        #Skip, if it's a silent pause.
+        if ref_anno[-1] == "<p:>":
+            continue
+        for wd_anno in wd_segs.get(ref_anno[0],[]):
+            wd_ind += 1
+            for mb_anno in mb_segs.get(wd_anno[0],[]):
+                if mb_anno[0] in pos_segs:
+                    segments.append((ref_ind,wd_ind,wd_anno[-1],mb_anno[-1],pos_segs[mb_anno[0]][0][-1]))
+    return segments
+
+def read_eaf_segments(file:str) -> list[tuple[int,int,str,str,str]]|None:
+    '''Reads the raw segments of an .eaf-file with `ETree.iterparse`.
+
+    Reads the same segments as `read_segments` in urum_extraction.py from the ref@, wd@, morph break and ps@ tiers only (see `read_eaf_tiers` and `get_tier_segments`).
+
+    Args:
+        file: Path to the .eaf-file.
+
+    Returns:
+        List with the segments of **file**, or None, if the file uses features not supported by this reader, in which case `read_segments` has to be used.
+    '''
+    return get_tier_segments(*read_eaf_tiers(file))
+
+#Parent tiers of the tiers needed for the segments in DoReCo (TextGrid-files do not contain the hierarchy of the tiers).
+DORECO_PARENTS = {"wd": "ref",
+                  "mb": "wd",
+                  "ps": "mb"}
+
+def get_textgrid_string(line:str,file) -> str:
+    '''Returns the string starting after the first quotation mark of **line** (continued by the next lines of **file**, if it contains line breaks) without its quotation marks and with doubled quotation marks as single ones.'''
+    string = line[line.index('"')+1:]
+    #A string ends with an odd number of quotation marks (doubled quotation marks are escaped ones).
+    while (len(string)-len(string.rstrip('"')))%2 == 0:
+        string += "\n"+next(file).rstrip("\r\n")
+    return string[:-1].replace('""','"')
+
+def read_textgrid_tiers(file:str) -> tuple[list[tuple[str,str|None]],dict[str,dict]]:
+    '''Streams a TextGrid-file (in the long text format) and keeps the intervals of the tiers needed for the segments only.
+
+    Reads **file** line by line. The parent of every tier is derived from the names of the DoReCo tiers (see **DORECO_PARENTS**). Every interval becomes a time-aligned annotation with its index in the tier as its ID.
+
+    Args:
+        file: Path to the TextGrid-file.
+
+    Returns:
+        Tuple with two elements like `read_eaf_tiers`.
+    '''
+    tiers = []
+    kept_tiers = {}
+    wd_parents = set()
+    tier = None
+    start = end = None
+    with open(file,encoding="utf-8-sig") as lines:
+        for line in lines:
+            line = line.strip()
+            if line.startswith("name = "):
+                name = get_textgrid_string(line,lines)
+                tier_type,_,speaker = name.partition("@")
+                parent = f"{DORECO_PARENTS[tier_type]}@{speaker}" if tier_type in DORECO_PARENTS else None
+                tier = add_tier(name,parent,tiers,kept_tiers,wd_parents)
+            elif tier is None:
+                continue
+            elif line.startswith("xmin = "):
+                start = float(line[7:])
+            elif line.startswith("xmax = "):
+                end = float(line[7:])
+            elif line.startswith("text = "):
+                tier["aligned"].append((f"{name}#{len(tier['aligned'])}",start,end,get_textgrid_string(line,lines)))
+    return tiers,kept_tiers
+
+def read_textgrid_segments(file:str) -> list[tuple[int,int,str,str,str]]|None:
+    '''Reads the raw segments of a TextGrid-file of DoReCo (see `read_textgrid_tiers` and `get_tier_segments`).
+
+    As a TextGrid-file only contains time-aligned intervals, every segment gets its parent from its start time. Empty intervals fill the gaps between the segments of a tier, as empty annotations do in the .eaf-files of DoReCo, so the segments, including the indices of their reference and word segments, are the same as the ones read from the .eaf-file (see benchmark_readers.py).
+    '''
+    return get_tier_segments(*read_textgrid_tiers(file))
+
+#Namespaces of DoReCo XML-files (TEI exported by corflow).
+TEI = "{http://www.tei-c.org/ns/1.0}"
+XML_ID = "{http://www.w3.org/XML/1998/namespace}id"
+
+def iterparse_text(file:str,events:tuple=("start","end"),chunk_size:int=2**16):
+    '''Parses the XML-file **file** incrementally like `ETree.iterparse`, but decodes it as UTF-8 before parsing, as DoReCo XML-files declare their encoding as *utf_8*, which the XML parser does not know.'''
+    parser = ETree.XMLPullParser(events)
+    with open(file,encoding="utf-8") as text:
+        while chunk := text.read(chunk_size):
+            parser.feed(chunk)
+            yield from parser.read_events()
+    parser.close()
+    yield from parser.read_events()
+
+def read_xml_tiers(file:str) -> tuple[list[tuple[str,str|None]],dict[str,dict]]:
+    '''Streams a DoReCo XML-file (TEI) and keeps the annotations of the tiers needed for the segments only.
+
+    Parses **file** incrementally (see `iterparse_text`) and frees every annotation block once it is read. The tiers and their parents are taken from the tier templates in the header. Every annotation block is a time-aligned annotation of the tier given by its speaker (*who*) with its utterance as its content and every span in it a referring annotation, whose target is the annotation it refers to.
+
+    Args:
+        file: Path to the XML-file.
+
+    Returns:
+        Tuple with two elements like `read_eaf_tiers`.
+    '''
+    times = {}
+    tiers = []
+    kept_tiers = {}
+    wd_parents = set()
+    context = iterparse_text(file)
+    _,root = next(context)
+    for event,elem in context:
+        if event == "start":
+            continue
+        if elem.tag == f"{TEI}note" and elem.get(XML_ID,"").startswith("TI"):
+            #Tier template with the code (name) and the parent of a tier.
+            template = {note.get("type"):note.text for note in elem}
+            add_tier(template["code"],template.get("parent"),tiers,kept_tiers,wd_parents)
+        elif elem.tag == f"{TEI}when":
+            if elem.get("absolute") is not None:
+                hours,minutes,seconds = elem.get("absolute").split(":")
+                times[elem.get(XML_ID)] = int(hours)*3600+int(minutes)*60+float(seconds)
+            else:
+                #Time codes in seconds (like in corflow).
+                times[elem.get(XML_ID)] = times[elem.get("since").lstrip("#")]+int(elem.get("interval"))/1000
+        elif elem.tag == f"{TEI}annotationBlock":
+            tier = kept_tiers.get(elem.get("who"))
+            if tier is not None:
+                seg = elem.find(f"{TEI}u/{TEI}seg")
+                content = seg.text if (seg is not None) and seg.text else ""
+                tier["aligned"].append((elem.get(XML_ID),times.get(elem.get("start","").lstrip("#")),times.get(elem.get("end","").lstrip("#")),content))
+            for span_grp in elem.iter(f"{TEI}spanGrp"):
+                tier = kept_tiers.get(span_grp.get("type"))
+                if tier is None:
+                    continue
+                for span in span_grp:
+                    tier["refs"].append((span.get(XML_ID),span.get("target","").lstrip("#"),span.text or ""))
+            elem.clear()
+        elif elem.tag == f"{TEI}teiHeader":
+            root.remove(elem)
+    return tiers,kept_tiers
+
+def read_xml_segments(file:str) -> list[tuple[int,int,str,str,str]]|None:
+    '''Reads the raw segments of a DoReCo XML-file (see `read_xml_tiers` and `get_tier_segments`). All segments get their parents from the annotations their spans refer to.'''
+    return get_tier_segments(*read_xml_tiers(file))
+
+#Functions reading the raw segments of a source file by its file extension.
+FORMAT_READERS = {".eaf": read_eaf_segments,
+                  ".TextGrid": read_textgrid_segments,
+                  ".xml": read_xml_segments}
@@ -0,0 +1,115 @@
+#Script written by Aleksandr Schamberger (GitHub: https://github.com/a-leks-icon) as part of the introductory course by Roland Meyer 'Einführung in die Computerlinguistik (mit Anwendung auf Slawische Sprachen)' at the Humboldt Universität zu Berlin in the winter semester 2023/24.
+
+#Normalizing (POS) tags and morph-tag-pairs of the preprocessing scripts with rule tables compiled into dictionary lookups,
+#counting how often every rule fires.
+
+from collections import Counter
+
+#Morph of a rule matching every suffix (every morph starting with '-').
+ANY_SUFFIX = "-"
+
+class TagNormalizer:
+    '''Rule-based normalization of tags.
+
+    There are three kinds of rules, each of them compiled into dictionaries, so that a tag is normalized by a few dictionary lookups:
+
+    * Tag rules map a tag (containing a typo or incoherence) to its cleaned tag. They apply to the tags of both words and morphs.
+    * Word rules map a morph and its tag to the tag of the word the morph belongs to. They only apply to tags without a tag rule.
+    * Morph rules map a morph and its cleaned tag to a new morph-tag-pair. They apply to the morph-tag-pairs after the tag rules.
+
+    The key of a word or morph rule is a tuple of a morph and a tag. A tag None matches every tag and the morph **ANY_SUFFIX** every suffix. The value of a morph rule is a tuple of a new morph (None for keeping the morph) and a new tag. If several rules match, only the most specific one applies: a rule for the morph and the tag before a rule for the morph before a rule for suffixes.
+
+    Attributes:
+        tag_rules: Dictionary mapping tags to cleaned tags.
+        word_rules: Dictionary with the word rules.
+        morph_rules: Dictionary with the morph rules.
+        lookups: Dictionary mapping *word* and *morph* to the compiled rules: a tuple of three dictionaries for rules with a morph and a tag, with a morph only and for suffixes with a tag.
+        hits: Counter mapping every rule and stream (a tuple of the kind of rule, its key and *word* or *morph*) to the number of times the rule applied to the tags of words or morphs.
+    '''
+
+    def __init__(self,tag_rules:dict[str,str],word_rules:dict[tuple,str],morph_rules:dict[tuple,tuple]):
+        '''Compiles the rules **tag_rules**, **word_rules** and **morph_rules** (see the attributes).'''
+        self.tag_rules = tag_rules
+        self.word_rules = word_rules
+        self.morph_rules = morph_rules
+        self.lookups = {"word": self.compile_rules(word_rules),
+                        "morph": self.compile_rules(morph_rules)}
+        self.hits = Counter()
+
+    @staticmethod
+    def compile_rules(rules:dict[tuple,object]) -> tuple[dict,dict,dict]:
+        '''Returns three dictionaries mapping the keys of the rules **rules** with a morph and a tag, with a morph only (tag None) and for suffixes with a tag (morph **ANY_SUFFIX**) to their keys and values.'''
+        pair_rules = {}
+        morph_rules = {}
+        suffix_rules = {}
+        for (morph,tag),value in rules.items():
+            if tag is None:
+                morph_rules[morph] = ((morph,tag),value)
+            elif morph == ANY_SUFFIX:
+                suffix_rules[tag] = ((morph,tag),value)
+            else:
+                pair_rules[(morph,tag)] = ((morph,tag),value)
+        return pair_rules,morph_rules,suffix_rules
+
+    def match(self,kind:str,morph:str,tag:str) -> object|None:
+        '''Returns the value of the most specific rule of **kind** (*word* or *morph*) matching **morph** and **tag** and counts its hit, or None, if no rule matches.'''
+        pair_rules,morph_rules,suffix_rules = self.lookups[kind]
+        rule = pair_rules.get((morph,tag)) or morph_rules.get(morph)
+        if (rule is None) and morph.startswith(ANY_SUFFIX):
+            rule = suffix_rules.get(tag)
+        if rule is None:
+            return None
+        self.hits[(kind,rule[0],kind)] += 1
+        return rule[1]
+
+    def clean_tag(self,tag:str,stream:str) -> str|None:
+        '''Returns the cleaned tag of **tag** and counts the hit of its tag rule for **stream** (*word* or *morph*), or None, if there is no tag rule for **tag**.'''
+        cleaned_tag = self.tag_rules.get(tag)
+        if cleaned_tag is not None:
+            self.hits[("tag",tag,stream)] += 1
+        return cleaned_tag
+
+    def get_word_tag(self,morph:str,tag:str) -> str:
+        '''Returns the normalized tag of a word given one of its morphs **morph** and its tag **tag** (see the tag and word rules).'''
+        cleaned_tag = self.clean_tag(tag,"word")
+        if cleaned_tag is not None:
+            return cleaned_tag
+        word_tag = self.match("word",morph,tag)
+        return tag if word_tag is None else word_tag
+
+    def get_morph_pair(self,morph:str,tag:str) -> tuple[str,str]:
+        '''Returns the normalized morph-tag-pair of **morph** and **tag** (see the tag and morph rules).'''
+        cleaned_tag = self.clean_tag(tag,"morph")
+        if cleaned_tag is not None:
+            tag = cleaned_tag
+        pair = self.match("morph",morph,tag)
+        if pair is None:
+            return (morph,tag)
+        return (morph if pair[0] is None else pair[0],pair[1])
+
+    def get_rules(self) -> list[tuple[str,object]]:
+        '''Returns a list with every rule as a tuple of its kind (*tag*, *word* or *morph*) and its key.'''
+        return [("tag",key) for key in self.tag_rules]+[("word",key) for key in self.word_rules]+[("morph",key) for key in self.morph_rules]
+
+    def pop_hits(self) -> Counter:
+        '''Returns the hits counted so far and starts counting anew.'''
+        hits,self.hits = self.hits,Counter()
+        return hits
+
+    def get_report(self,hits:Counter|None=None) -> str:
+        '''Returns the number of hits of every rule as a string, one line per rule in the order of the rules, with separate numbers for the tags of words and morphs in case of tag rules. By default, **hits** is None indicating to report the hits of this normalizer.'''
+        hits = self.hits if hits is None else hits
+        lines = []
+        for kind,key in self.get_rules():
+            if kind == "tag":
+                #Tag rules apply to both streams, so their hits are reported per stream.
+                rule = f"{key!r} -> {self.tag_rules[key]!r}"
+                lines.append(f"{kind} rule {rule}: {hits[(kind,key,'word')]} (words), {hits[(kind,key,'morph')]} (morphs)")
+            else:
+                morph,tag = key
+                value = self.word_rules[key] if kind == "word" else self.morph_rules[key]
+                morph = "any suffix" if morph == ANY_SUFFIX else repr(morph)
+                tag = "any tag" if tag is None else repr(tag)
+                rule = f"({morph}, {tag}) -> {value!r}"
+                lines.append(f"{kind} rule {rule}: {hits[(kind,key,kind)]}")
+        return "\n".join(lines)
@@ -0,0 +1,309 @@
+#Script written by Aleksandr Schamberger (GitHub: https://github.com/a-leks-icon) as part of the introductory course by Roland Meyer 'Einführung in die Computerlinguistik (mit Anwendung auf Slawische Sprachen)' at the Humboldt Universität zu Berlin in the winter semester 2023/24.
+
+#Extracting word-tag-pairs and morph-tag-pairs from the Urum .eaf-files in one pass:
+#Every file is parsed once (in a process pool) into raw segments, which are cached per file,
+#and both pair streams are collected from the same cleaning pass over its segments, which normalizes the tags with compiled rule tables.
+
+from corflow.fromElan import fromElan
+import glob
+import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import groupby
+from operator import itemgetter
+from segment_cache import SegmentCache
+from segment_readers import read_eaf_segments, read_textgrid_segments, read_xml_segments
+from tag_normalization import ANY_SUFFIX, TagNormalizer
+
+#Path of the Urum source files (.eaf-, TextGrid- and XML-files).
+source_path = "../../data/source/doreco_urum1249_extended/"
+#Names of the files with preprocessed data.
+words_file = "../../data/preprocessed/urum_words.txt"
+morphs_file = "../../data/preprocessed/urum_morphs.txt"
+#Path of the directory caching the raw segments of every source file (None for no cache).
+cache_dir = "../../data/cache/urum/"
+#Version of the functions reading the raw segments (see `READERS`). Increase it whenever the raw segments read from a file change.
+EXTRACTOR_VERSION = 1
+#Strings, based on which to ignore segments.
+bad_strings = ["", "****", "<p:>"]
+#Accepted DoReCo lables.
+doreco_labels = ["<<fm", "<<pr", "<<ui"]
+#Dictionary to change those pos tags containing typos or incoherences.
+clean_pos_dict = {
+    "PN-case": "PN",
+    "Pn.": "Pn.A",
+    "PN?": "PN",
+    "VV": "V",
+    "REF.PN": "PN",
+    "Q\t": "Q",
+    "N-num": "N",
+    "INT": "INTJ",
+    "NV": "V",
+    "AN": "N",
+    "INF": "V",
+    #"X": "-X",
+    "-tma": "-tam",
+    "-tam-V": "-tam",
+    "-tamA": "A",
+    "-tam-tam": "-tam",
+    "-tam-prs": "-prs",
+    "tam-V": "tam",
+    "-prsQ": "Q",
+    "-cases": "-case",
+    "case": "-case",
+    "-caseV": "V",
+    "allow": "V",
+    "-N?": "-N",
+    "-PST": "-V",
+    "-pts": "-prs",
+    "-nam": "-num",
+    "v": "V",
+    "-inf": "-fin",
+    "-PRT": "PRT"
+}
+#Some morph-tag-pairs were wrong and could not be changed by just adding a key-value-pair to the dictionary.
+#Tags of words given one of their morphs and its tag (None for any tag), only used for tags not in `clean_pos_dict`.
+word_pos_rules = {
+    ("-to",None): "PRT",
+    ("-što",None): "PN",
+    ("o","-PN"): "PN",
+    ("-kim",None): "PN"
+}
+#Morph-tag-pairs given a morph and its cleaned tag (None for any tag, `ANY_SUFFIX` for any suffix).
+#The first element of a new pair is None for keeping the morph.
+morph_pos_rules = {
+    (ANY_SUFFIX,"X"): (None,"-X"),
+    ("-lari","-PN"): (None,"-prs"),
+    ("-to",None): ("to","PRT"),
+    ("-što",None): ("što","PN"),
+    ("o","-PN"): (None,"PN"),
+    ("-kim",None): ("kim","PN")
+}
+#Normalizer applying all of the rules above in one pass over the segments.
+normalizer = TagNormalizer(clean_pos_dict,word_pos_rules,morph_pos_rules)
+
+def get_tiers(trans) -> tuple:
+    '''Returns the reference tier of a transcription **trans** (created by `fromElan`) and its respective word, morph break and pos tier.'''
+    for ref_tier in trans.findAllName("ref@"):
+        for ch_tier in ref_tier.children():
+            if ch_tier.name.startswith("wd@"):
+                wd_tier = ch_tier
+                break
+        mb_tier = wd_tier.children()[0]
+        for ch_tier in mb_tier.children():
+            if ch_tier.name.startswith("ps@"):
+                pos_tier = ch_tier
+                break
+    return ref_tier,wd_tier,mb_tier,pos_tier
+
+def read_segments(file:str) -> list[tuple[int,int,str,str,str]]:
+    '''Reads the raw segments of an .eaf-file.
+
+    Parses **file** and traverses its tiers (ref@ → wd@ → morph break → ps@) once. Every morph with a pos tag gives a segment (ref, wd, word, morph, pos): the indices of its reference and word segment in the file and the unchanged contents of its word, morph break and pos segment. Silent pauses on the ref tier are left out.
+
+    Args:
+        file: Path to the .eaf-file.
+
+    Returns:
+        List with the segments of **file** in the order of the tiers.
+    '''
+    #Create a transcription object.
+    trans = fromElan(file,encoding="utf-8")
+    ref_tier,wd_tier,mb_tier,pos_tier = get_tiers(trans)
+    segments = []
+    wd_ind = 0
+    #Iterate through every reference segment on the ref tier.
+    for ref_ind,ref_seg in enumerate(ref_tier):
+        #Skip, if it's a silent pause.
+        if ref_seg.content == "<p:>":
+            continue
+        if wd_tier in ref_seg.childDict():
+            #Iterate through every word segment on the wd tier.
+            for wd_seg in ref_seg.childDict()[wd_tier]:
+                wd_ind += 1
+                if mb_tier in wd_seg.childDict():
+                    #Iterate through every morph break segment and its pos segment.
+                    for mb_seg in wd_seg.childDict()[mb_tier]:
+                        if pos_tier in mb_seg.childDict():
+                            pos_seg = mb_seg.childDict()[pos_tier][0]
+                            segments.append((ref_ind,wd_ind,wd_seg.content,mb_seg.content,pos_seg.content))
+    return segments
+
+def read_segments_fallback(file:str,read) -> list[tuple[int,int,str,str,str]]:
+    '''Reads the raw segments of a source file **file** with **read** (see `segment_readers.py`), falling back on `read_segments` for the .eaf-file with the same stem, if **read** does not support **file** (returns None).
+
+    Raises:
+        ValueError: If **read** does not support **file** and there is no .eaf-file with the same stem.
+    '''
+    segments = read(file)
+    if segments is not None:
+        return segments
+    eaf_file = os.path.splitext(file)[0]+".eaf"
+    if not os.path.exists(eaf_file):
+        raise ValueError(f"The tiers of {file} are not supported and there is no .eaf-file to fall back on: {eaf_file}")
+    return read_segments(eaf_file)
+
+def read_segments_iterparse(file:str) -> list[tuple[int,int,str,str,str]]:
+    '''Reads the raw segments of an .eaf-file like `read_segments`, but with the streaming reader `read_eaf_segments` (faster and with less memory), falling back on `read_segments` for files it does not support.'''
+    return read_segments_fallback(file,read_eaf_segments)
+
+def read_segments_textgrid(file:str) -> list[tuple[int,int,str,str,str]]:
+    '''Reads the raw segments of a TextGrid-file with `read_textgrid_segments`, falling back on `read_segments` for the .eaf-file with the same stem for files it does not support.'''
+    return read_segments_fallback(file,read_textgrid_segments)
+
+def read_segments_xml(file:str) -> list[tuple[int,int,str,str,str]]:
+    '''Reads the raw segments of a DoReCo XML-file with `read_xml_segments`, falling back on `read_segments` for the .eaf-file with the same stem for files it does not support.'''
+    return read_segments_fallback(file,read_xml_segments)
+
+#Functions reading the raw segments of a source file (all of them return the same segments, see benchmark_readers.py)
+#and the file extension of the format they read.
+READERS = {"corflow": read_segments,
+           "iterparse": read_segments_iterparse,
+           "textgrid": read_segments_textgrid,
+           "xml": read_segments_xml}
+READER_FORMATS = {"corflow": ".eaf",
+                  "iterparse": ".eaf",
+                  "textgrid": ".TextGrid",
+                  "xml": ".xml"}
+
+def normalize_segments(segments:list[tuple[int,int,str,str,str]]) -> tuple[list[tuple[str,str]],list[tuple[str,str]]]:
+    '''Cleans raw segments and collects their word-tag-pairs and morph-tag-pairs.
+
+    Tags and morph-tag-pairs are normalized by **normalizer** (see `TagNormalizer`) in the same pass. For every word, the first morph with a tag starting with an uppercase letter (except for 'X') gives the tag of the word. The morphs of a word are kept, unless its root is not well-formed. Every reference segment ends with the end tag *<E>* in both lists.
+
+    Args:
+        segments: List with the segments of a file (see `read_segments`).
+
+    Returns:
+        Tuple with two lists: the word-tag-pairs and the morph-tag-pairs of **segments**.
+    '''
+    tagged_words = []
+    tagged_morphs = []
+    #Iterate through every reference segment.
+    for ref_ind,ref_segments in groupby(segments,itemgetter(0)):
+        #Iterate through every word segment.
+        for wd_ind,wd_segments in groupby(ref_segments,itemgetter(1)):
+            wd_segments = list(wd_segments)
+            word = wd_segments[0][2]
+            for label in doreco_labels:
+                if word.startswith(label):
+                    word = word.removeprefix(label).replace(">","")
+            #Skip, if the word starts with an inappropriate DoReCo label, if
+            #it's empty, if it's the DoReCo label '****' or a silent pause.
+            if (word.startswith("<<")) | (word in bad_strings):
+                    continue
+            #Whether the word-tag-pair of the word has been collected.
+            word_found = False
+            #Initialize a temporary list to to collect morph-tag-pairs and to
+            #check whether morphs constitute a well-formed word.
+            tagged_morphs_temp = []
+            #Iterate through every morph and its pos tag.
+            for _,_,_,mb_content,pos_content in wd_segments:
+                #Skip, if it's empty, the DoReCo label '****' or a silent pause.
+                if pos_content in bad_strings:
+                    continue
+                #Remove any whitespace.
+                pos = pos_content.replace(" ","")
+                if not word_found:
+                    word_pos = normalizer.get_word_tag(mb_content,pos)
+                    #Continue only, if the first character of the pos tag
+                    #starts with an uppercase letter (except for 'X').
+                    if re.search("[A-WY-Z]",word_pos[0]):
+                        #Collect the word-tag-pair without leading and trailing whitespaces.
+                        tagged_words.append((word.strip(),word_pos))
+                        word_found = True
+                mb = mb_content.replace(" ","")
+                #Collect the normalized morph-tag-pair.
+                tagged_morphs_temp.append(normalizer.get_morph_pair(mb,pos))
+            #Do not add morph-tag-pairs, if the root they belong to
+            #is not well-formed (its pos tag equals "X").
+            well_formed = True
+            for mb,pos in tagged_morphs_temp:
+                if (pos in ["xxx", "X", "?"]) & (not mb.startswith("-")):
+                    well_formed = False
+            #Otherwise, add the morph-tag-pairs.
+            if well_formed:
+                tagged_morphs.extend(tagged_morphs_temp)
+        #After having iterated through every word and morph and its pos tag given a ref seg,
+        #add the end tag to the lists of pairs to encode the end of a sentence.
+        for tagged_pairs in (tagged_words,tagged_morphs):
+            if tagged_pairs and tagged_pairs[-1][-1] != "<E>":
+                tagged_pairs.append(("<E>","<E>"))
+    return tagged_words,tagged_morphs
+
+def extract_file(file:str,cache_dir:str|None=None,reader:str="iterparse") -> tuple[list[tuple[str,str]],list[tuple[str,str]],Counter]:
+    '''Extracts the word-tag-pairs and the morph-tag-pairs of a source file (e.g. an .eaf-file).
+
+    Reads the raw segments of **file** with **reader** (see **READERS**) and cleans them (see `normalize_segments`). With a cache directory **cache_dir**, the raw segments are taken from the cache (see `SegmentCache`), unless the content of **file** or **EXTRACTOR_VERSION** changed, so only the cleaning runs again.
+
+    Args:
+        file: Path to the source file.
+        cache_dir: Path to the cache directory. By default, **cache_dir** is None indicating to parse **file** without a cache.
+        reader: String representing the name of the function reading the raw segments (see **READERS**).
+
+    Returns:
+        Tuple with three elements: the word-tag-pairs and the morph-tag-pairs of **file** and a Counter with the hits of every normalization rule (see `TagNormalizer`).
+    '''
+    if cache_dir is None:
+        segments = READERS[reader](file)
+    else:
+        segments = SegmentCache(cache_dir,EXTRACTOR_VERSION).get(file,READERS[reader])
+    normalizer.pop_hits()
+    tagged_words,tagged_morphs = normalize_segments(segments)
+    return tagged_words,tagged_morphs,normalizer.pop_hits()
+
+def extract_files(eaf_files:list[str],workers:int|None=None,cache_dir:str|None=None,reader:str="iterparse") -> tuple[list[tuple[str,str]],list[tuple[str,str]],Counter]:
+    '''Extracts the word-tag-pairs and the morph-tag-pairs of several source files.
+
+    Every file is parsed in a pool of **workers** processes (see `extract_file`). The pairs of the files are merged in the sorted order of their paths, so the result does not depend on the order of **eaf_files** or on the number of workers.
+
+    Args:
+        eaf_files: List with the paths to the source files (in the format of **reader**, see **READER_FORMATS**).
+        workers: Integer representing the number of processes. By default, **workers** is None indicating to use one process per CPU core.
+        cache_dir: Path to the directory caching the raw segments of every file. By default, **cache_dir** is None indicating to parse every file.
+        reader: String representing the name of the function reading the raw segments (see **READERS**).
+
+    Returns:
+        Tuple with three elements: the word-tag-pairs and the morph-tag-pairs of all files and a Counter with the hits of every normalization rule summed over all files.
+    '''
+    eaf_files = sorted(eaf_files)
+    workers = min(workers or os.cpu_count() or 1,max(len(eaf_files),1))
+    extract = partial(extract_file,cache_dir=cache_dir,reader=reader)
+    if workers == 1:
+        results = list(map(extract,eaf_files))
+    else:
+        with ProcessPoolExecutor(workers) as executor:
+            results = list(executor.map(extract,eaf_files))
+    tagged_words = []
+    tagged_morphs = []
+    hits = Counter()
+    for file_words,file_morphs,file_hits in results:
+        tagged_words.extend(file_words)
+        tagged_morphs.extend(file_morphs)
+        hits.update(file_hits)
+    return tagged_words,tagged_morphs,hits
+
+def write_pairs(file_path:str,tagged_pairs:list[tuple[str,str]]):
+    '''Saves every token-tag-pair of **tagged_pairs** with ';' as a delimiter in the .csv-file **file_path**.'''
+    with open(file_path,"w") as file:
+        for w,t in tagged_pairs:
+            file.write(w+";"+t+"\n")
+
+#START OPERATIONS#
+
+if __name__ == "__main__":
+    #Function reading the raw segments of every file (see `READERS`).
+    reader = "iterparse"
+    #Get all source files in the format of the reader in a list.
+    eaf_files = glob.glob(source_path+"/*"+READER_FORMATS[reader])
+    #Number of processes (None for one per CPU core).
+    workers = None
+    tagged_words,tagged_morphs,hits = extract_files(eaf_files,workers,cache_dir,reader)
+    write_pairs(words_file,tagged_words)
+    write_pairs(morphs_file,tagged_morphs)
+    #Report how often every normalization rule fired (rules without hits may be obsolete).
+    print("Hits of the normalization rules:")
+    print(normalizer.get_report(hits))
+    print(f"Done.")
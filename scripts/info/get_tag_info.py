@@ -3,44 +3,30 @@
 #Created: 2024-05-09
 #Latest Version: 2024-09-29
 
-import pandas as pd
+import sys
+from collections.abc import Iterable
+sys.path.append("../tagger")
+from corpus import iter_tagged_tokens
 
-def get_csv_as_list(file_path:str,separator:str) -> list[tuple[str,str]]:
-    '''Imports a .csv-file as a list.
-
-    Imports a .csv-file **file_path** with **separator** as the delimiter and returns it as a list with tuples. Every tuple represents a row/line and every element in a tuple represents a unique value in a column.
-    
-    Args:
-        file_path: Path to the .csv-file.
-        separator: Delimiter used to separate datapoints in the .csv-file.
-
-    Returns:
-        A list of tuples.
-    '''
-    tagged_words = pd.read_csv(file_path,sep=separator,header=None,on_bad_lines="warn")
-    tagged_words = tagged_words.dropna()
-    tagged_words_l = tagged_words.values.tolist()
-    return [(i[0],i[1]) for i in tagged_words_l]
-
-def get_sent_num(wd_tag_pairs:list[tuple[str,str]]) -> int:
+def get_sent_num(wd_tag_pairs:Iterable[tuple[str,str]]) -> int:
     '''Return the number of sentences.
 
-    Compute the number of sentences for a list of word-tag-pairs **wd_tag_pairs** based on the end tag `<E>` and whether the end tag's previous tag is not an end tag.
+    Compute the number of sentences for an Iterable of word-tag-pairs **wd_tag_pairs** (e.g. a list or the stream returned by `iter_tagged_tokens`) based on the end tag `<E>` and whether the end tag's previous tag is not an end tag.
 
     Args:
-        wd_tag_pairs: List of word-tag-pairs (tuples).
+        wd_tag_pairs: Iterable of word-tag-pairs (tuples).
 
     Returns:
         Integer representing the number of sentences.
     '''
     sents_num = 0
-    tokens = []
+    in_sent = False
     for wd,tag in wd_tag_pairs:
         if tag != "<E>":
-            tokens.append(tag)
-        elif tokens:
+            in_sent = True
+        elif in_sent:
             sents_num += 1
-            tokens = []
+            in_sent = False
     return sents_num
 
 #START OPERATIONS#
@@ -49,26 +35,22 @@ def get_sent_num(wd_tag_pairs:list[tuple[str,str]]) -> int:
 data_path = "../../data/preprocessed/"
 #File to be processed.
 file = "brown_medium.txt"
-#Get word-tag-pairs from the respective file as tuples inside a list.
-wd_tag_pairs = get_csv_as_list(data_path+file,"\t")
-#List of unique pos tags.
-tags = list(set([tag for wd,tag in wd_tag_pairs]))
-#Set of word types.
-words = set([wd for wd,tag in wd_tag_pairs])
-#Create a dictionary with pos tags as keys.
-tags_dict = dict.fromkeys(tags)
-#Iterate through every key (pos tag) in the dictionary
-#and set the key's value equal to a tag's token frequency
-for tag in tags_dict:
-    num = len([t for wd,t in wd_tag_pairs if t == tag])
-    tags_dict[tag] = num
+#Stream the word-tag-pairs from the respective file. Collect the word types
+#and count the token frequency of every pos tag as well as all pairs.
+words = set()
+tags_dict = {}
+pairs_num = 0
+for wd,tag in iter_tagged_tokens(data_path+file,"\t"):
+    words.add(wd)
+    tags_dict[tag] = tags_dict.get(tag,0) + 1
+    pairs_num += 1
 #Sort the dictionary keys based on their values in descending order.
 tags_dict = {k:v for k,v in sorted(tags_dict.items(),key=lambda item: item[1], reverse=True)}
-#Get the number of sentences.
-sents_num = get_sent_num(wd_tag_pairs)
+#Get the number of sentences (streaming the file a second time).
+sents_num = get_sent_num(iter_tagged_tokens(data_path+file,"\t"))
 print(tags_dict)
-print(f"Total number of tokens: {len(wd_tag_pairs)-sents_num}")
+print(f"Total number of tokens: {pairs_num-sents_num}")
 print(f"Number of unique pos tags: {len(tags_dict)}")
 print(f"Number of word/morph types: {len(words)}")
 print(f"Number of sentences: {sents_num}")
-print(f"Average number of tokens per sentence: {round((len(wd_tag_pairs)-sents_num)/sents_num,2)}")
+print(f"Average number of tokens per sentence: {round((pairs_num-sents_num)/sents_num,2)}")
@@ -10,12 +10,8 @@ csv_file = "../../results/accuracy_and_time.csv"
 df = pd.read_csv(csv_file,header=0,sep=";")
 #Arange the data into lists.
 datasets = ["Urum Words", "Urum Morphs", "Brown Small", "Brown Medium", "Brown Words"]
-times = []
-for time in df["time_real"]:
-    t = time.partition("m")
-    minutes = float(t[0])
-    seconds = float(t[-1])/60
-    times.append(round(minutes+seconds,2))
+#The running times are given in seconds.
+times = [round(seconds/60,2) for seconds in df["time_real_sec"]]
 
 #Changing the font size of the plots.
 font_size = 14
@@ -32,7 +28,8 @@ ax.set_ylabel("Excecution time in minutes")
 ax.set_ylim(top=160,bottom=0)
 #Add the value (percentage) of every bar on top of it.
 for i in range(len(datasets)):
-    ax.text(i,times[i]+1,str(df["time_real"][i])+"sec",ha="center",va="bottom")
+    minutes,seconds = divmod(round(df["time_real_sec"][i]),60)
+    ax.text(i,times[i]+1,f"{minutes}m{seconds:02d}sec",ha="center",va="bottom")
 #Print the plot.
 plt.tight_layout()
 plt.show()
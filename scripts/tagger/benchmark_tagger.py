@@ -0,0 +1,141 @@
+#Script written by Aleksandr Schamberger (GitHub: https://github.com/a-leks-icon) as part of the introductory course by Roland Meyer 'Einführung in die Computerlinguistik (mit Anwendung auf Slawische Sprachen)' at the Humboldt Universität zu Berlin in the winter semester 2023/24.
+
+#Benchmark of the training and decoding stages of pos_tagger.py on every preprocessed dataset:
+#Throughput (tokens per second), peak RSS and tracemalloc peak per dataset, and a regression check against a stored baseline.
+
+import json
+import math
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from corpus import Corpus
+from pos_tagger import train_hmm_corpus, test_hmm_corpus
+
+def get_peak_rss() -> int:
+    '''Returns the peak resident set size of the current process in bytes.'''
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    #Linux reports kilobytes, macOS reports bytes.
+    return peak_rss if sys.platform == "darwin" else peak_rss*1024
+
+def benchmark_dataset(file_path:str,separator:str,warmup:int=1,repeats:int=5,seed:int=469283984701,size:float=0.8,batch_size:int=64) -> dict:
+    '''Benchmarks the training and decoding stages on one dataset.
+
+    Splits the sentences of the dataset **file_path** into training and test data with **seed**, trains an HMM on the training data (see `train_hmm_corpus`) and tags the test data (see `test_hmm_corpus`) **warmup** times without measuring and **repeats** times measuring the time of both stages. Afterwards, both stages run once more while tracemalloc traces the allocations, which slows them down, so this run is not timed.
+
+    Args:
+        file_path: Path to the preprocessed dataset.
+        separator: Delimiter used to separate tokens and tags in the dataset.
+        warmup: Integer representing the number of runs before measuring.
+        repeats: Integer representing the number of measured runs.
+        seed: Integer used to split the data.
+        size: Float representing the size of the training data.
+        batch_size: Integer representing the maximal number of test sentences decoded at once.
+
+    Returns:
+        Dictionary with the number of training and test tokens, the median throughput of training and decoding in tokens per second (*train_tok_per_sec*, *decode_tok_per_sec*), the median time of both stages in seconds, the peak RSS in bytes (*peak_rss*) and the peak of the memory traced by tracemalloc in bytes (*tracemalloc_peak*).
+    '''
+    corpus = Corpus.from_file(file_path,separator)
+    sent_inds = np.random.default_rng(seed).permutation(len(corpus))
+    split_num = math.ceil(len(corpus)*size)
+    train_inds,test_inds = sent_inds[:split_num],sent_inds[split_num:]
+    train_tokens = int(corpus.lengths[train_inds].sum())
+    test_tokens = int(corpus.lengths[test_inds].sum())
+    train_times = []
+    decode_times = []
+    for run in range(warmup+repeats):
+        start = time.perf_counter_ns()
+        model,type_map,tag_map = train_hmm_corpus(corpus,train_inds)
+        trained = time.perf_counter_ns()
+        test_hmm_corpus(model,type_map,tag_map,corpus,test_inds,False,batch_size)
+        decoded = time.perf_counter_ns()
+        if run >= warmup:
+            train_times.append((trained-start)/1e9)
+            decode_times.append((decoded-trained)/1e9)
+    tracemalloc.start()
+    model,type_map,tag_map = train_hmm_corpus(corpus,train_inds)
+    test_hmm_corpus(model,type_map,tag_map,corpus,test_inds,False,batch_size)
+    tracemalloc_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    train_time = statistics.median(train_times)
+    decode_time = statistics.median(decode_times)
+    return {"train_tokens": train_tokens,
+            "test_tokens": test_tokens,
+            "train_sec": train_time,
+            "decode_sec": decode_time,
+            "train_tok_per_sec": train_tokens/train_time,
+            "decode_tok_per_sec": test_tokens/decode_time,
+            "peak_rss": get_peak_rss(),
+            "tracemalloc_peak": tracemalloc_peak}
+
+def check_regressions(results:dict[str,dict],baseline:dict[str,dict],margin:float=0.2) -> list[str]:
+    '''Compares the throughput of a benchmark with a baseline.
+
+    Args:
+        results: Dictionary mapping every dataset to its results (see `benchmark_dataset`).
+        baseline: Dictionary in the same form as **results**, e.g. the results of an earlier benchmark.
+        margin: Float representing the largest accepted drop of the throughput relative to the baseline (e.g. 0.2 for 20%).
+
+    Returns:
+        List with a message for every stage of every dataset whose throughput dropped by more than **margin**. Datasets missing in **baseline** are not checked.
+    '''
+    regressions = []
+    for dataset,result in results.items():
+        if dataset not in baseline:
+            continue
+        for key in ("train_tok_per_sec","decode_tok_per_sec"):
+            ratio = result[key]/baseline[dataset][key]
+            if ratio < 1-margin:
+                regressions.append(f"{dataset}: {key} dropped to {ratio*100:.1f}% of the baseline ({result[key]:.0f} vs. {baseline[dataset][key]:.0f}).")
+    return regressions
+
+#START OPERATIONS#
+
+if __name__ == "__main__":
+    #Path to preprocessed data.
+    data_path = "../../data/preprocessed/"
+    #Files to be processed and their delimiters.
+    datasets = {"urum_words.txt": ";",
+                "urum_morphs.txt": ";",
+                "brown_small.txt": "\t",
+                "brown_medium.txt": "\t",
+                "brown_words.txt": "\t"}
+    #Number of runs before measuring and number of measured runs per dataset.
+    warmup = 1
+    repeats = 10
+    #Seed to split the data (the same split in every run).
+    seed = 469283984701
+    #Path of the .json-file with the results of this benchmark (None for not saving them).
+    results_path = "../../results/benchmark.json"
+    #Path of the .json-file with the baseline to compare the results with (None for no regression check).
+    #The baseline depends on the machine, so create it on the same machine by copying the results of a benchmark.
+    baseline_path = "../../results/benchmark_baseline.json"
+    #Largest accepted drop of the throughput relative to the baseline.
+    margin = 0.25
+
+    results = {}
+    for dataset,separator in datasets.items():
+        print(f"Benchmarking dataset: {dataset}")
+        #Run every dataset in its own process, so that the peak RSS only belongs to this dataset.
+        with ProcessPoolExecutor(1) as executor:
+            results[dataset] = executor.submit(benchmark_dataset,data_path+dataset,separator,warmup,repeats,seed).result()
+        result = results[dataset]
+        print(f"Training: {result['train_tok_per_sec']:.0f} tokens/s. Decoding: {result['decode_tok_per_sec']:.0f} tokens/s. Peak RSS: {result['peak_rss']/2**20:.1f} MiB. Tracemalloc peak: {result['tracemalloc_peak']/2**20:.1f} MiB.")
+
+    if results_path:
+        print(f"Saving results: {results_path}")
+        with open(results_path,"w",encoding="utf-8") as file:
+            json.dump(results,file,indent=2)
+
+    if baseline_path:
+        with open(baseline_path,encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = check_regressions(results,baseline,margin)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions compared to the baseline (margin: {margin*100:.0f}%).")
@@ -0,0 +1,46 @@
+#Script written by Aleksandr Schamberger (GitHub: https://github.com/a-leks-icon) as part of the introductory course by Roland Meyer 'Einführung in die Computerlinguistik (mit Anwendung auf Slawische Sprachen)' at the Humboldt Universität zu Berlin in the winter semester 2023/24.
+
+#Micro-benchmark comparing the cost of looking up test tokens in the trained model:
+#(1) Before: Checking whether a token is in a list of types and getting the emission probability of every tag from a pandas data frame.
+#(2) After: Encoding a sentence with a hash-indexed vocabulary and getting the emission probabilities by indexing arrays.
+
+import time
+from pos_tagger import get_csv_as_list, get_sent_from_wd_tag_pairs, split_train_test, reduce_dim, get_emission_probability, train_hmm, get_candidate_tags
+from vocabulary import Vocabulary
+
+#Path to preprocessed data.
+data_path = "../../data/preprocessed/"
+#File to be processed and its delimiter.
+dataset = "brown_words.txt"
+separator = "\t"
+#Maximal number of test tokens looked up with the old method (checking a list is slow).
+sample_size = 2000
+
+tagged_tokens = get_csv_as_list(data_path+dataset,separator)
+tagged_sentences = get_sent_from_wd_tag_pairs(tagged_tokens,"<E>","<E>")
+train_sentences,test_sentences = split_train_test(tagged_sentences,seed=469283984701)
+test_tokens = [token for token,tag in reduce_dim(test_sentences)]
+
+#Before: List of types and data frame with emission probabilities.
+emis_p_df = get_emission_probability(reduce_dim(train_sentences))
+voc = list(emis_p_df.index)
+tags = list(emis_p_df.columns)
+start = time.perf_counter_ns()
+for token in test_tokens[:sample_size]:
+    if token in voc:
+        for tag in tags:
+            emis_p = emis_p_df.at[token,tag]
+before = (time.perf_counter_ns()-start)/len(test_tokens[:sample_size])
+
+#After: Vocabulary and sparse emission probabilities.
+model = train_hmm(train_sentences)
+start = time.perf_counter_ns()
+for sent_ids in model["vocabulary"].encode_many([[token for token,tag in sent] for sent in test_sentences]):
+    for type_ind in sent_ids:
+        if type_ind != Vocabulary.UNK_ID:
+            cand_tags,emis_p = get_candidate_tags(model,type_ind)
+after = (time.perf_counter_ns()-start)/len(test_tokens)
+
+print(f"Dataset: {dataset}. Types: {len(voc)}. Tags: {len(tags)}. Test tokens: {len(test_tokens)}.")
+print(f"Before (list and data frame): {round(before)} ns per token.")
+print(f"After (vocabulary and arrays): {round(after)} ns per token.")
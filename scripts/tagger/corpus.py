@@ -0,0 +1,187 @@
+#Script written by Aleksandr Schamberger (GitHub: https://github.com/a-leks-icon) as part of the introductory course by Roland Meyer 'Einführung in die Computerlinguistik (mit Anwendung auf Slawische Sprachen)' at the Humboldt Universität zu Berlin in the winter semester 2023/24.
+
+#Streaming the preprocessed datasets (one token-tag-pair per line) without loading the whole file and storing them as compact integer arrays.
+
+import numpy as np
+from array import array
+from collections.abc import Iterable, Iterator
+
+def detect_separator(file_path:str,separators:tuple[str,...]=("\t",";"),lines_num:int=100) -> str:
+    '''Detects the delimiter of a .csv-file.
+
+    Reads the first **lines_num** lines of the .csv-file **file_path** and returns the first of **separators** found in all non-empty lines (e.g. a tab for the Brown datasets and ";" for the Urum datasets). A tab is checked first, because tokens may contain ";".
+
+    Args:
+        file_path: Path to the .csv-file.
+        separators: Tuple with the possible delimiters in the order they are checked.
+        lines_num: Integer representing the number of lines checked.
+
+    Returns:
+        String representing the delimiter.
+
+    Raises:
+        ValueError: If none of **separators** is found in all checked lines.
+    '''
+    with open(file_path,encoding="utf-8") as file:
+        lines = [line for line,n in zip(file,range(lines_num)) if line.strip()]
+    for separator in separators:
+        if lines and all([separator in line for line in lines]):
+            return separator
+    raise ValueError(f"None of the separators {separators} is found in every line of {file_path}.")
+
+def iter_tagged_tokens(file_path:str,separator:str=";") -> Iterator[tuple[str,str]]:
+    '''Streams the token-tag-pairs of a .csv-file.
+
+    Reads a .csv-file **file_path** line by line and yields every line as a token-tag-pair. Every line is split at the last **separator**, so tokens may contain **separator** themselves. Lines without **separator** and lines with an empty token or tag are skipped. Only one line is kept in memory at a time.
+
+    Args:
+        file_path: Path to the .csv-file.
+        separator: Delimiter used to separate tokens and tags in the .csv-file.
+
+    Yields:
+        Tuple with two strings: a (word or morph) token and its (POS) tag.
+    '''
+    with open(file_path,encoding="utf-8") as file:
+        for line in file:
+            token,sep,tag = line.rstrip("\r\n").rpartition(separator)
+            if sep and token and tag:
+                yield (token,tag)
+
+def iter_tagged_sentences(file_path:str,separator:str=";",tok_end:str="<E>",tag_end:str="<E>") -> Iterator[list[tuple[str,str]]]:
+    '''Streams the sentences of a .csv-file.
+
+    Reads the token-tag-pairs of a .csv-file **file_path** (see `iter_tagged_tokens`) and yields a list of token-tag-pairs representing a sentence at every pair with **tok_end** as the token or **tag_end** as the tag, which encodes the end of a sentence. Empty sentences are skipped. Only one sentence is kept in memory at a time.
+
+    Args:
+        file_path: Path to the .csv-file.
+        separator: Delimiter used to separate tokens and tags in the .csv-file.
+        tok_end: String for identifying the end of a sentence for tokens.
+        tag_end: String for identifying the end of a sentence for tags.
+
+    Yields:
+        List with tuples representing the token-tag-pairs of a sentence.
+    '''
+    sent = []
+    for tok,tag in iter_tagged_tokens(file_path,separator):
+        if (tok != tok_end) & (tag != tag_end):
+            sent.append((tok,tag))
+        elif sent:
+            yield sent
+            sent = []
+
+def get_ranges(starts:np.ndarray,lengths:np.ndarray) -> np.ndarray:
+    '''Concatenates several ranges of integers.
+
+    Creates one NumPy array containing the integers from starts[i] to starts[i]+lengths[i] (exclusive) for every i one after another without a loop.
+
+    Args:
+        starts: NumPy array with the first integer of every range.
+        lengths: NumPy array with the length of every range.
+
+    Returns:
+        NumPy array (int64) with the concatenated ranges.
+    '''
+    lengths = np.asarray(lengths,dtype=np.int64)
+    return np.repeat(np.asarray(starts,dtype=np.int64)-np.cumsum(lengths)+lengths,lengths)+np.arange(lengths.sum())
+
+class Corpus:
+    '''Compact representation of tagged sentences.
+
+    Stores the tokens and tags of all sentences as integer ids in one flat array each, together with an array of sentence offsets and the string tables belonging to the ids. A sentence is a view of the flat arrays, and selecting, flattening or framing (with *<S>* and *<E>*) several sentences only needs index arrays, so no lists of token-tag-pairs have to be copied.
+
+    Attributes:
+        types: List of (word or morph) types. The index of a type is its id.
+        tags: List of (POS) tags. The index of a tag is its id.
+        token_ids: NumPy array (int32) with the type id of every token of all sentences one after another.
+        tag_ids: NumPy array (int8 or int16) with the tag id of every token of all sentences one after another.
+        offsets: NumPy array (int64). The tokens of sentence i are found between the indices offsets[i] and offsets[i+1] of **token_ids** and **tag_ids**.
+    '''
+
+    def __init__(self,sentences:Iterable[list[tuple[str,str]]]):
+        '''Encodes tagged **sentences**.
+
+        Args:
+            sentences: Iterable (e.g. a list or the stream returned by `iter_tagged_sentences`) containing lists representing sentences. Each list contains tuples representing token-tag-pairs.
+        '''
+        types_ind = {}
+        tags_ind = {}
+        token_ids = array("i")
+        tag_ids = array("i")
+        offsets = array("q",[0])
+        for sent in sentences:
+            for token,tag in sent:
+                token_ids.append(types_ind.setdefault(token,len(types_ind)))
+                tag_ids.append(tags_ind.setdefault(tag,len(tags_ind)))
+            offsets.append(len(token_ids))
+        self.types = list(types_ind)
+        self.tags = list(tags_ind)
+        self.token_ids = np.frombuffer(token_ids,dtype=np.int32)
+        self.tag_ids = np.frombuffer(tag_ids,dtype=np.int32).astype(np.int8 if len(self.tags) <= 127 else np.int16)
+        self.offsets = np.frombuffer(offsets,dtype=np.int64)
+
+    @classmethod
+    def from_file(cls,file_path:str,separator:str=";"):
+        '''Encodes the sentences of a .csv-file streamed with `iter_tagged_sentences`.
+
+        Args:
+            file_path: Path to the .csv-file.
+            separator: Delimiter used to separate tokens and tags in the .csv-file.
+
+        Returns:
+            Corpus.
+        '''
+        return cls(iter_tagged_sentences(file_path,separator))
+
+    def __len__(self) -> int:
+        return len(self.offsets)-1
+
+    @property
+    def lengths(self) -> np.ndarray:
+        '''NumPy array with the number of tokens of every sentence.'''
+        return np.diff(self.offsets)
+
+    def get_sentence_ids(self,sent_ind:int) -> tuple[np.ndarray,np.ndarray]:
+        '''Returns views of the type ids and tag ids of the sentence with the index **sent_ind**.'''
+        start,end = self.offsets[sent_ind],self.offsets[sent_ind+1]
+        return self.token_ids[start:end],self.tag_ids[start:end]
+
+    def get_sentence(self,sent_ind:int) -> list[tuple[str,str]]:
+        '''Returns the sentence with the index **sent_ind** as a list of token-tag-pairs.'''
+        token_ids,tag_ids = self.get_sentence_ids(sent_ind)
+        return [(self.types[token_id],self.tags[tag_id]) for token_id,tag_id in zip(token_ids.tolist(),tag_ids.tolist())]
+
+    def get_sentences(self,sent_inds:Iterable[int]|None=None) -> list[list[tuple[str,str]]]:
+        '''Returns the sentences with the indices **sent_inds** (by default all sentences) as lists of token-tag-pairs.'''
+        if sent_inds is None:
+            sent_inds = range(len(self))
+        return [self.get_sentence(sent_ind) for sent_ind in sent_inds]
+
+    def get_token_indices(self,sent_inds:np.ndarray) -> np.ndarray:
+        '''Flattens several sentences.
+
+        Args:
+            sent_inds: NumPy array with the indices of sentences.
+
+        Returns:
+            NumPy array with the indices (in **token_ids** and **tag_ids**) of all tokens of the sentences **sent_inds** one after another.
+        '''
+        return get_ranges(self.offsets[sent_inds],self.lengths[sent_inds])
+
+    def get_framed_tag_ids(self,sent_inds:np.ndarray,start_id:int,end_id:int) -> np.ndarray:
+        '''Frames several sentences with a start and an end tag.
+
+        Args:
+            sent_inds: NumPy array with the indices of sentences.
+            start_id: Integer used as the id of the tag *<S>* preceding every sentence.
+            end_id: Integer used as the id of the tag *<E>* following every sentence.
+
+        Returns:
+            NumPy array (int64) with **start_id**, the tag ids of the sentence and **end_id** for every sentence in **sent_inds** one after another.
+        '''
+        lengths = self.lengths[sent_inds]
+        framed_starts = np.cumsum(lengths+2)-(lengths+2)
+        framed = np.empty((lengths+2).sum(),dtype=np.int64)
+        framed[framed_starts] = start_id
+        framed[framed_starts+lengths+1] = end_id
+        framed[get_ranges(framed_starts+1,lengths)] = self.tag_ids[self.get_token_indices(sent_inds)]
+        return framed
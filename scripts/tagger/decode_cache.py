@@ -0,0 +1,96 @@
+#Script written by Aleksandr Schamberger (GitHub: https://github.com/a-leks-icon) as part of the introductory course by Roland Meyer 'Einführung in die Computerlinguistik (mit Anwendung auf Slawische Sprachen)' at the Humboldt Universität zu Berlin in the winter semester 2023/24.
+
+#Caching the sequences of (POS) tags decoded by the Viterbi algorithm in pos_tagger.py, so that repeated sentences are only decoded once per model.
+
+import hashlib
+import sys
+import numpy as np
+from collections import OrderedDict
+
+#Arrays of a trained HMM the decoded sequences depend on.
+HASH_KEYS = ("emis_indptr","emis_tags","emis_values","trans_p")
+
+def get_model_hash(model:dict) -> str:
+    '''Hashes a trained HMM.
+
+    Hashes the arrays of the emission and transition probabilities and the most frequently occuring tag of a trained **model** (see `train_hmm`), which determine the sequence decoded for a sentence of ids. Two models with the same hash decode every sentence the same way.
+
+    Args:
+        model: Dictionary representing a trained HMM (see `train_hmm`).
+
+    Returns:
+        String with the hexadecimal hash.
+    '''
+    digest = hashlib.blake2b(digest_size=16)
+    for key in HASH_KEYS:
+        array = np.ascontiguousarray(model[key])
+        digest.update(f"{key}:{array.dtype.str}:{array.shape}".encode("utf-8"))
+        digest.update(array.tobytes())
+    digest.update(f"most_frequent_tag:{int(model['most_frequent_tag'])}".encode("utf-8"))
+    return digest.hexdigest()
+
+class DecodeCache:
+    '''Least recently used (LRU) cache of decoded sequences.
+
+    Maps a key of a model hash (see `get_model_hash`), the scoring mode and the ids of a sentence to its decoded sequence of tag indices (or None, if no sequence exists) and its decoded length (see `viterbi_algorithm_batch`). If the cache grows larger than its size cap, the least recently used sequences are removed. The size of an entry is estimated from the sizes of its key and sequence.
+
+    Attributes:
+        max_bytes: Integer representing the size cap in bytes.
+        bytes: Integer representing the estimated size of all entries in bytes.
+        hits: Integer representing the number of lookups finding a sequence.
+        misses: Integer representing the number of lookups finding no sequence.
+        entries: Ordered dictionary mapping every key to its sequence, its decoded length and its size, with the least recently used entry first.
+    '''
+
+    def __init__(self,max_mb:float=64):
+        '''Creates an empty cache with a size cap of **max_mb** megabytes.'''
+        self.max_bytes = int(max_mb*2**20)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.entries = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @staticmethod
+    def get_key(model_hash:str,sent_ids:np.ndarray,log_space:bool=False) -> tuple:
+        '''Returns the key of the sentence **sent_ids** decoded with the model hashed as **model_hash** in the scoring mode **log_space**.'''
+        return (model_hash,log_space,tuple(sent_ids.tolist()))
+
+    def get(self,key:tuple) -> tuple[bool,list[int]|None,int]:
+        '''Looks up a sequence.
+
+        Args:
+            key: Tuple representing the key of a sentence (see `get_key`).
+
+        Returns:
+            Tuple with three elements: a boolean indicating whether **key** is in the cache, the cached sequence as a new list (or None, if no sequence exists or **key** is not in the cache) and its decoded length (0, if **key** is not in the cache).
+        '''
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False,None,0
+        self.hits += 1
+        self.entries.move_to_end(key)
+        seq,decoded_length,size = entry
+        return True,None if seq is None else list(seq),decoded_length
+
+    def put(self,key:tuple,seq:list[int]|None,decoded_length:int):
+        '''Adds the sequence **seq** and the decoded length **decoded_length** of the sentence with the key **key** and removes the least recently used sequences, if the cache is too large.'''
+        if key in self.entries:
+            self.bytes -= self.entries.pop(key)[2]
+        seq = None if seq is None else tuple(seq)
+        #Estimated size: the tuples of the key and the sequence and their integers.
+        size = sys.getsizeof(key)+sys.getsizeof(key[2])+sys.getsizeof(seq)+28*len(key[2])
+        if size > self.max_bytes:
+            return
+        self.entries[key] = (seq,decoded_length,size)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            self.bytes -= self.entries.popitem(last=False)[1][2]
+
+    def clear(self):
+        '''Removes all sequences (the counters are kept).'''
+        self.entries.clear()
+        self.bytes = 0
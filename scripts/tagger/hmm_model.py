@@ -0,0 +1,101 @@
+#Script written by Aleksandr Schamberger (GitHub: https://github.com/a-leks-icon) as part of the introductory course by Roland Meyer 'Einführung in die Computerlinguistik (mit Anwendung auf Slawische Sprachen)' at the Humboldt Universität zu Berlin in the winter semester 2023/24.
+
+#Saving and loading HMMs trained by `train_hmm` in pos_tagger.py.
+
+import numpy as np
+import json
+import zipfile
+from decode_cache import get_model_hash
+from vocabulary import Vocabulary
+
+#Name and version of the file format. Increase the version whenever the content of a file changes.
+FORMAT_NAME = "pos-tagger-hmm"
+FORMAT_VERSION = 2
+#Arrays saved in a model file.
+ARRAY_KEYS = ("emis_indptr","emis_tags","emis_values","log_emis_values","trans_p","log_trans_p")
+
+def save_model(model:dict,file_path:str):
+    '''Saves a trained HMM.
+
+    Saves a trained **model** (see `train_hmm`) as an uncompressed .npz-file **file_path**. The file contains the (sparse) emission and transition probabilities and their logarithms as arrays and a JSON header with the format version, the (word or morph) types, the (POS) tags and the most frequently occuring tag. The arrays are saved uncompressed, so they can be memory-mapped when loading the model.
+
+    Args:
+        model: Dictionary representing a trained HMM (see `train_hmm`).
+        file_path: Path to the .npz-file.
+    '''
+    header = {"format": FORMAT_NAME,
+              "version": FORMAT_VERSION,
+              "types": model["vocabulary"].types,
+              "tags": list(model["tags_ind"]),
+              "most_frequent_tag": int(model["most_frequent_tag"])}
+    header = np.frombuffer(json.dumps(header,ensure_ascii=False).encode("utf-8"),dtype=np.uint8)
+    arrays = {key:np.ascontiguousarray(model[key]) for key in ARRAY_KEYS}
+    with open(file_path,"wb") as file:
+        np.savez(file,header=header,**arrays)
+
+def get_npz_memmaps(file_path:str) -> dict[str,np.ndarray]:
+    '''Memory-maps the arrays of an uncompressed .npz-file.
+
+    Finds the position of every array in an uncompressed .npz-file (a zip-file containing .npy-files) **file_path** and memory-maps the array in read-only mode. Compressed arrays are loaded into memory instead.
+
+    Args:
+        file_path: Path to the .npz-file.
+
+    Returns:
+        Dictionary mapping the name of every array to the (memory-mapped) array.
+    '''
+    arrays = {}
+    with zipfile.ZipFile(file_path) as archive, open(file_path,"rb") as file:
+        for info in archive.infolist():
+            name = info.filename.removesuffix(".npy")
+            if info.compress_type != zipfile.ZIP_STORED:
+                with archive.open(info) as member:
+                    arrays[name] = np.lib.format.read_array(member)
+                continue
+            #The data of a member starts after its local file header (30 bytes), its name and its extra field.
+            file.seek(info.header_offset+26)
+            name_len = int.from_bytes(file.read(2),"little")
+            extra_len = int.from_bytes(file.read(2),"little")
+            file.seek(info.header_offset+30+name_len+extra_len)
+            #Read the header of the .npy-file.
+            version = np.lib.format.read_magic(file)
+            if version == (1,0):
+                shape,fortran_order,dtype = np.lib.format.read_array_header_1_0(file)
+            else:
+                shape,fortran_order,dtype = np.lib.format.read_array_header_2_0(file)
+            arrays[name] = np.memmap(file_path,dtype=dtype,mode="r",offset=file.tell(),shape=shape,order="F" if fortran_order else "C")
+    return arrays
+
+def load_model(file_path:str,mmap:bool=True) -> dict:
+    '''Loads a trained HMM.
+
+    Loads a model saved with `save_model` from the .npz-file **file_path** and returns it in the same form as `train_hmm`.
+
+    Args:
+        file_path: Path to the .npz-file.
+        mmap: Boolean indicating whether to memory-map the arrays instead of reading them into memory.
+
+    Returns:
+        Dictionary representing a trained HMM (see `train_hmm`).
+
+    Raises:
+        ValueError: If the file is not a model file or its version is not supported.
+    '''
+    if mmap:
+        arrays = get_npz_memmaps(file_path)
+    else:
+        with np.load(file_path) as npz:
+            arrays = {name:npz[name] for name in npz.files}
+    if "header" not in arrays:
+        raise ValueError(f"{file_path} is not a model file.")
+    header = json.loads(bytes(arrays["header"]).decode("utf-8"))
+    if header.get("format") != FORMAT_NAME:
+        raise ValueError(f"{file_path} is not a model file.")
+    if header["version"] != FORMAT_VERSION:
+        raise ValueError(f"Version {header['version']} of {file_path} is not supported (expected version {FORMAT_VERSION}).")
+    model = {key:arrays[key] for key in ARRAY_KEYS}
+    model["vocabulary"] = Vocabulary(header["types"])
+    model["tags_ind"] = {tag:ind for ind,tag in enumerate(header["tags"])}
+    model["most_frequent_tag"] = header["most_frequent_tag"]
+    model["model_hash"] = get_model_hash(model)
+    return model
@@ -2,15 +2,29 @@
 
 #Script is inspired by the blog post from MyGreatLearning <https://www.mygreatlearning.com/blog/pos-tagging/> (accessed on 2024-01-28).
 
-import pandas as pd
 import numpy as np
+import argparse
 import math
-from operator import itemgetter
+import os
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from collections import Counter
+from typing import TYPE_CHECKING
+from hmm_model import save_model
+from profiler import profiler
+from vocabulary import Vocabulary
+from corpus import detect_separator, iter_tagged_tokens, get_ranges, Corpus
+from decode_cache import get_model_hash, DecodeCache
+
+#Pandas is only needed for the data frames, so it is imported when they are created (importing it takes longer than importing the rest of the module).
+if TYPE_CHECKING:
+    import pandas as pd
 
 def get_csv_as_list(file_path:str,separator:str=";") -> list[tuple[str,str]]:
     '''Imports a .csv-file as a list.
 
-    Imports a .csv-file **file_path** with **separator** as the delimiter and returns it as a list with tuples. Every tuple represents a row/line and every element in a tuple represents a unique value in a column.
+    Imports a .csv-file **file_path** with **separator** as the delimiter and returns it as a list with tuples. Every tuple represents a row/line and every element in a tuple represents a unique value in a column. The lines are read with `iter_tagged_tokens`.
 
     Args:
         file_path: Path to the .csv-file.
@@ -19,10 +33,7 @@ def get_csv_as_list(file_path:str,separator:str=";") -> list[tuple[str,str]]:
     Returns:
         A list of tuples.
     '''
-    tagged_tokens = pd.read_csv(file_path,sep=separator,header=None,on_bad_lines="warn")
-    tagged_tokens = tagged_tokens.dropna()
-    tagged_tokens_l = tagged_tokens.values.tolist()
-    return [(i[0],i[1]) for i in tagged_tokens_l]
+    return list(iter_tagged_tokens(file_path,separator))
 
 def get_sent_from_wd_tag_pairs(tok_tag_pairs:list,tok_end:str,tag_end:str) -> list[list]:
     '''Create a list containing lists representing sentences.
@@ -47,28 +58,112 @@ def get_sent_from_wd_tag_pairs(tok_tag_pairs:list,tok_end:str,tag_end:str) -> li
             sent = []
     return tagged_sents
 
-def split_train_test(data:list,size:float=0.8,seed:bool|int|float=False) -> tuple[list,list]:
+def get_rng(seed:bool|int|float|np.random.SeedSequence|None=False) -> np.random.Generator:
+    '''Creates a pseudorandom number generator.
+
+    Args:
+        seed: Number or NumPy seed sequence to initialize the generator. If **seed** is False or None, no random seed is given.
+
+    Returns:
+        NumPy random number generator.
+    '''
+    if isinstance(seed,bool):
+        seed = None
+    return np.random.default_rng(seed)
+
+def get_length_strata(lengths:np.ndarray,strata_num:int) -> np.ndarray:
+    '''Groups sentences by their length.
+
+    Splits the sentences into **strata_num** groups (strata) of about the same size at the quantiles of their lengths **lengths**. Sentences of the same length belong to the same stratum, so there may be fewer strata.
+
+    Args:
+        lengths: NumPy array with the number of tokens of every sentence.
+        strata_num: Integer representing the number of strata.
+
+    Returns:
+        NumPy array with the index of the stratum of every sentence (shorter sentences have lower indices).
+    '''
+    bounds = np.unique(np.quantile(lengths,np.linspace(0,1,strata_num+1)[1:-1]))
+    return np.searchsorted(bounds,lengths,side="right")
+
+def permute_split(sents_num:int,size:float,rng:np.random.Generator,strata:np.ndarray|None=None) -> tuple[np.ndarray,int]:
+    '''Randomly permutes the indices of sentences for a split into training and test data.
+
+    Returns a permutation of the indices of **sents_num** sentences, whose first **split_num** indices represent the training and whose remaining indices represent the test data. **split_num** equals **sents_num** multiplied by **size** (rounded up). Without **strata**, the permutation is the same as shuffling a list of the sentences with **rng**. With **strata**, every stratum is split in the ratio **size** on its own (the remaining training sentences go to the strata with the largest remainders), so the training and test data contain sentences of all lengths in the same proportions.
+
+    Args:
+        sents_num: Integer representing the number of sentences.
+        size: Float representing the size of the training data.
+        rng: NumPy random number generator.
+        strata: NumPy array with the stratum of every sentence (see `get_length_strata`). By default, **strata** is None indicating no stratification.
+
+    Returns:
+        Tuple with two elements: a NumPy array with the permutation and an integer representing the number of training sentences **split_num**.
+    '''
+    split_num = math.ceil(sents_num*size)
+    if strata is None:
+        return rng.permutation(sents_num),split_num
+    strata_inds = [np.flatnonzero(strata == stratum) for stratum in np.unique(strata)]
+    counts = np.array([len(inds) for inds in strata_inds])
+    train_nums = np.floor(counts*size).astype(np.int64)
+    remainders = counts*size-train_nums
+    train_nums[np.argsort(-remainders,kind="stable")[:split_num-train_nums.sum()]] += 1
+    perms = [rng.permutation(inds) for inds in strata_inds]
+    train_inds = rng.permutation(np.concatenate([perm[:train_num] for perm,train_num in zip(perms,train_nums)]))
+    test_inds = rng.permutation(np.concatenate([perm[train_num:] for perm,train_num in zip(perms,train_nums)]))
+    return np.concatenate([train_inds,test_inds]),split_num
+
+def split_indices(sents_num:int,size:float=0.8,seed:bool|int|float|np.random.SeedSequence=False,strata:np.ndarray|None=None) -> tuple[np.ndarray,np.ndarray]:
+    '''Splits the indices of sentences into training and test data.
+
+    Randomly splits the indices of **sents_num** sentences (see `permute_split`) into the indices of the training and the test sentences, which can be used to select sentences of a list or a corpus (see `Corpus`) without changing or copying them.
+
+    Args:
+        sents_num: Integer representing the number of sentences.
+        size: Float representing the size of the training data.
+        seed: Number or NumPy seed sequence to initialize the pseudorandom number generator (see `get_rng`). By default, **seed** is False indicating that no random seed is given.
+        strata: NumPy array with the stratum of every sentence (see `get_length_strata`). By default, **strata** is None indicating no stratification.
+
+    Returns:
+        Tuple with two NumPy arrays containing the indices of the training and the test sentences respectively.
+    '''
+    sent_inds,split_num = permute_split(sents_num,size,get_rng(seed),strata)
+    return sent_inds[:split_num],sent_inds[split_num:]
+
+def get_epoch_splits(sents_num:int,seeds:list[np.random.SeedSequence],size:float=0.8,strata:np.ndarray|None=None) -> tuple[np.ndarray,int]:
+    '''Creates the splits of all epochs up front.
+
+    Args:
+        sents_num: Integer representing the number of sentences.
+        seeds: List with a NumPy seed sequence for every epoch.
+        size: Float representing the size of the training data.
+        strata: NumPy array with the stratum of every sentence (see `get_length_strata`). By default, **strata** is None indicating no stratification.
+
+    Returns:
+        Tuple with two elements: a NumPy array (epochs x sentences) with a permutation of the indices of the sentences for every epoch (see `permute_split`) and an integer representing the number of training sentences, which are the first indices of every permutation.
+    '''
+    split_num = math.ceil(sents_num*size)
+    permutations = np.empty((len(seeds),sents_num),dtype=np.int64)
+    for epoch,seed in enumerate(seeds):
+        permutations[epoch] = permute_split(sents_num,size,get_rng(seed),strata)[0]
+    return permutations,split_num
+
+def split_train_test(data:list,size:float=0.8,seed:bool|int|float|np.random.SeedSequence=False) -> tuple[list,list]:
     '''Splits **data** into training and test data.
 
-    Splits a list with lists representing sentences **data** into two separate lists by pseudo randomly shuffling **data** with a pseudorandom **seed**. The size of the training data equals the length of **data* multiplied by **size**. The test data amounts to the remaining data.
+    Splits a list with lists representing sentences **data** into two separate lists by pseudo randomly permuting the indices of the sentences with a pseudorandom **seed** (see `split_indices`). The size of the training data equals the length of **data* multiplied by **size**. The test data amounts to the remaining data. **data** is not changed, so splitting it several times with the same seed always returns the same outcome.
 
     Args:
         data: List containing lists representing sentences. Each list contains tuples representing token-tag-pairs.
         size: Float representing the size of the training data.
-        seed: Number to initialize the pseudorandom number generator used to randomly split the data into training and test data. Used to control how the data is being split. Using the same number results in the same outcome for the training and test data. By default, **seed** is False indicating that no random seed is given.
+        seed: Number or NumPy seed sequence to initialize the pseudorandom number generator used to randomly split the data into training and test data. Used to control how the data is being split. Using the same number results in the same outcome for the training and test data. By default, **seed** is False indicating that no random seed is given.
 
     Returns:
         Tuple with two lists containing the training and test data respectively.
     '''
-    if isinstance(seed,bool):
-        rng = np.random.default_rng()
-    elif isinstance(seed,(int,float)):
-        rng = np.random.default_rng(seed)
-    split_num = math.ceil(len(data)*size)
-    random_data = data
-    rng.shuffle(random_data)
-    train = random_data[:split_num]
-    test = random_data[split_num:]
+    train_inds,test_inds = split_indices(len(data),size,seed)
+    train = [data[ind] for ind in train_inds]
+    test = [data[ind] for ind in test_inds]
     return (train,test)
 
 def reduce_dim(data:list):
@@ -85,7 +180,160 @@ def reduce_dim(data:list):
         new_data += item
     return new_data
 
-def get_emission_probability(training_data:list) -> pd.DataFrame:
+def get_emission_ids(training_data:list) -> tuple[np.ndarray,np.ndarray,Vocabulary,dict[str,int]]:
+    '''Encodes every token-tag-pair as a pair of integers.
+
+    Maps every (word or morph) type and every unique (POS) tag of a list of token-tag-pairs **training_data** to an integer index in the order of their first occurrence.
+
+    Args:
+        training_data: List with tuples representing token-tag-pairs to train a model.
+
+    Returns:
+        Tuple with four elements. The first and second element are NumPy arrays with the index of the type and the tag of every token-tag-pair respectively. The third element is a vocabulary mapping every type to its index. The fourth element is a dictionary mapping every tag to its index.
+    '''
+    vocabulary = Vocabulary()
+    tags_ind = {}
+    type_ids = np.empty(len(training_data),dtype=np.int64)
+    tag_ids = np.empty(len(training_data),dtype=np.int64)
+    for n,(token,tag) in enumerate(training_data):
+        type_ids[n] = vocabulary.add(token)
+        tag_ids[n] = tags_ind.setdefault(tag,len(tags_ind))
+    return type_ids,tag_ids,vocabulary,tags_ind
+
+def get_emission_counts(training_data:list) -> tuple[np.ndarray,Vocabulary,dict[str,int]]:
+    '''Counts every token-tag-pair in a single pass.
+
+    Maps every (word or morph) type and every unique (POS) tag of a list of token-tag-pairs **training_data** to an integer index (see `get_emission_ids`) and counts how often every type occurs with every tag. The counts are collected in one pass over the tokens.
+
+    Args:
+        training_data: List with tuples representing token-tag-pairs to train a model.
+
+    Returns:
+        Tuple with three elements. The first element is a NumPy array with the counts, whose rows represent (word or morph) types and whose columns represent unique (POS) tags. The second element is a vocabulary mapping every type to its row index. The third element is a dictionary mapping every tag to its column index.
+    '''
+    type_ids,tag_ids,vocabulary,tags_ind = get_emission_ids(training_data)
+    #Count every <type,tag> pair at once by flattening the index of the pair into the index of a one-dimensional array.
+    counts = np.bincount(type_ids*len(tags_ind)+tag_ids,minlength=len(vocabulary)*len(tags_ind))
+    counts = counts.reshape((len(vocabulary),len(tags_ind)))
+    return counts,vocabulary,tags_ind
+
+def get_emission_matrix(training_data:list) -> tuple[np.ndarray,Vocabulary,dict[str,int]]:
+    '''Creates a NumPy array with emission probabilities.
+
+    Returns a NumPy array containing the emission probability of every unique token-tag-pair from a given list of token-tag-pairs **training_data** together with the dictionaries mapping types and tags to their indices (see `get_emission_counts`).
+
+    Args:
+        training_data: List with tuples representing token-tag-pairs to train a model.
+
+    Returns:
+        Tuple with three elements. The first element is a NumPy array with emission probabilities, whose rows represent (word or morph) types and whose columns represent unique (POS) tags. The second element is a vocabulary mapping every type to its row index. The third element is a dictionary mapping every tag to its column index.
+    '''
+    #P(word|tag) = (P(word) ∩ P(tag))/P(tag)
+    #P(word|tag) = C(<tag,word>)/C(<tag,X>)
+    counts,vocabulary,tags_ind = get_emission_counts(training_data)
+    tag_counts = counts.sum(axis=0)
+    emis_prob_array = counts/tag_counts
+    return emis_prob_array,vocabulary,tags_ind
+
+def get_sparse_emission_matrix(training_data:list) -> tuple[dict[str,np.ndarray],Vocabulary,dict[str,int]]:
+    '''Creates a sparse matrix with emission probabilities.
+
+    Returns the emission probabilities of a given list of token-tag-pairs **training_data** (see `get_emission_matrix`) as a sparse matrix in the compressed sparse row (CSR) format, which only contains the probabilities greater than 0. Most types only occur with one or two tags, so the sparse matrix needs much less memory than the dense one for large vocabularies. The dense matrix is never created.
+
+    Args:
+        training_data: List with tuples representing token-tag-pairs to train a model.
+
+    Returns:
+        Tuple with three elements. The first element is a dictionary with three NumPy arrays: *indptr* (the probabilities of the type with index i are found between the indices indptr[i] and indptr[i+1] of the other arrays), *tags* (the index of the tag of every probability) and *values* (the probabilities). The second element is a vocabulary mapping every type to its row index. The third element is a dictionary mapping every tag to its column index.
+    '''
+    type_ids,tag_ids,vocabulary,tags_ind = get_emission_ids(training_data)
+    emis_csr = get_sparse_emission_values(type_ids,tag_ids,len(vocabulary),len(tags_ind))
+    return emis_csr,vocabulary,tags_ind
+
+def get_sparse_emission_values(type_ids:np.ndarray,tag_ids:np.ndarray,types_num:int,tags_num:int) -> dict[str,np.ndarray]:
+    '''Creates a sparse matrix with emission probabilities from encoded token-tag-pairs.
+
+    Args:
+        type_ids: NumPy array with the index of the type of every token-tag-pair.
+        tag_ids: NumPy array with the index of the tag of every token-tag-pair.
+        types_num: Integer representing the number of types.
+        tags_num: Integer representing the number of tags.
+
+    Returns:
+        Dictionary with the three NumPy arrays *indptr*, *tags* and *values* of the sparse matrix (see `get_sparse_emission_matrix`).
+    '''
+    type_ids = type_ids.astype(np.int64)
+    tag_ids = tag_ids.astype(np.int64)
+    #Count every <type,tag> pair occurring in the data. The unique pairs are sorted by type first and tag second.
+    pairs,counts = np.unique(type_ids*tags_num+tag_ids,return_counts=True)
+    pair_type_ids,pair_tag_ids = np.divmod(pairs,tags_num)
+    indptr = np.zeros(types_num+1,dtype=np.int64)
+    np.cumsum(np.bincount(pair_type_ids,minlength=types_num),out=indptr[1:])
+    #P(word|tag) = C(<tag,word>)/C(<tag,X>)
+    tag_counts = np.bincount(tag_ids,minlength=tags_num)
+    return {"indptr": indptr,
+            "tags": pair_tag_ids,
+            "values": counts/tag_counts[pair_tag_ids]}
+
+def get_emission_memory(training_data:list) -> dict[str,int]:
+    '''Compares the memory needed for the emission probabilities.
+
+    Computes the number of bytes needed for the emission probabilities of **training_data** as a pandas data frame (see `get_emission_probability`) and as a sparse matrix (see `get_sparse_emission_matrix`).
+
+    Args:
+        training_data: List with tuples representing token-tag-pairs to train a model.
+
+    Returns:
+        Dictionary with the number of bytes for the keys *dense* (data frame including its index and columns) and *sparse* (arrays of the sparse matrix).
+    '''
+    emis_p_df = get_emission_probability(training_data)
+    emis_csr = get_sparse_emission_matrix(training_data)[0]
+    return {"dense": int(emis_p_df.memory_usage(index=True,deep=True).sum()),
+            "sparse": sum([array.nbytes for array in emis_csr.values()])}
+
+def get_candidate_tags(model:dict,type_ind:int,log_space:bool=False) -> tuple[np.ndarray,np.ndarray]:
+    '''Gets the tags a type can be emitted by.
+
+    Looks up the (POS) tags with an emission probability greater than 0 for the (word or morph) type with the index **type_ind** in the sparse emission probabilities of a trained **model** (see `train_hmm`).
+
+    Args:
+        model: Dictionary representing a trained HMM (see `train_hmm`).
+        type_ind: Integer representing the index of a type.
+        log_space: Boolean indicating whether to return the logarithms of the probabilities.
+
+    Returns:
+        Tuple with two NumPy arrays: The indices of the tags and their (log) emission probabilities.
+    '''
+    start,end = model["emis_indptr"][type_ind],model["emis_indptr"][type_ind+1]
+    values = model["log_emis_values"] if log_space else model["emis_values"]
+    return model["emis_tags"][start:end],values[start:end]
+
+def get_emission_rows(model:dict,type_ids:np.ndarray,log_space:bool=False) -> np.ndarray:
+    '''Gets the dense emission probabilities of several types.
+
+    Creates a dense array with the (log) emission probabilities of every tag for the (word or morph) types with the indices **type_ids** from the sparse emission probabilities of a trained **model** (see `train_hmm`). **Vocabulary.UNK_ID** represents out-of-vocabulary tokens, which cannot be emitted by any tag.
+
+    Args:
+        model: Dictionary representing a trained HMM (see `train_hmm`).
+        type_ids: NumPy array with indices of types.
+        log_space: Boolean indicating whether to return the logarithms of the probabilities.
+
+    Returns:
+        NumPy array, whose rows represent the types in **type_ids** and whose columns represent the tags. Impossible emissions have the probability 0 (-inf in log space).
+    '''
+    indptr = model["emis_indptr"]
+    values = model["log_emis_values"] if log_space else model["emis_values"]
+    rows = np.full((len(type_ids),len(model["tags_ind"])-2),-np.inf if log_space else 0,dtype=np.float64)
+    known = type_ids != Vocabulary.UNK_ID
+    known_ids = np.where(known,type_ids,0)
+    starts = np.where(known,indptr[known_ids],0)
+    lengths = np.where(known,indptr[known_ids+1]-starts,0)
+    #Positions of the probabilities of every type in the sparse matrix one after another.
+    positions = get_ranges(starts,lengths)
+    rows[np.repeat(np.arange(len(type_ids)),lengths),model["emis_tags"][positions]] = values[positions]
+    return rows
+
+def get_emission_probability(training_data:list) -> "pd.DataFrame":
     '''Creates a pandas data frame with emission probabilities.
 
     Returns a pandas data frame containing the emission probability of every unique token-tag-pair from a given list of token-tag-pairs **training_data**. In the final data frame, rows represent (word or morph) types and columns represent unique (POS) tags.
@@ -96,38 +344,84 @@ def get_emission_probability(training_data:list) -> pd.DataFrame:
     Returns:
         Pandas data frame with emission probabilities. Rows represent (word or morph) types and columns represent unique (POS) tags.
     '''
+    emis_prob_array,vocabulary,tags_ind = get_emission_matrix(training_data)
+    import pandas as pd
+    return pd.DataFrame(emis_prob_array,index=list(vocabulary),columns=list(tags_ind))
 
-    def get_emission_probability_base(type:str,tag:str,training_data:list) -> float:
-        '''Returns the emission probability.
+def get_transition_counts(training_sentences:list,tags_ind:dict[str,int]|None=None) -> tuple[np.ndarray,dict[str,int]]:
+    '''Counts every bigram of (POS) tags in a single pass.
 
-        Returns a float representing the emission probability of a (word or morph) **type** given a (POS) **tag** from a list of token-tag-pairs **training_data**.
+    Encodes the (POS) tags of every sentence in **training_sentences** as integers, which are framed by the pseudo tags *<S>* and *<E>*, and counts every bigram of tags inside a sentence at once. Bigrams crossing the boundary between two sentences (*<E>* followed by *<S>*) are not counted.
 
-        Args:
-            type: String representing a (word or morph) type.
-            tag: String representing a unique (POS) tag.
-            training_data: List with tuples representing token-tag-pairs to train a model.
+    Args:
+        training_sentences: List containing lists representing sentences. Each list contains tuples representing token-tag-pairs used to train a model.
+        tags_ind: Dictionary mapping unique (POS) tags without *<S>* and *<E>* to indices (e.g. the one returned by `get_emission_counts`). It is not changed. Tags missing in **tags_ind** are added in the order of their first occurrence. By default, **tags_ind** is None and a new dictionary is created.
 
-        Returns:
-            Float representing the emission probability.
-        '''
-        #P(word|tag) = (P(word) ∩ P(tag))/P(tag)
-        #P(word|tag) = C(<tag,word>)/C(<tag,X>)
-        pairs_with_tag = [(tp,t) for tp,t in training_data if t == tag]
-        tag_count = len(pairs_with_tag)
-        type_tag_count = len([tp for tp,t in pairs_with_tag if tp == type])
-        return type_tag_count/tag_count
-
-    types = tuple(set([token for token,tag in training_data]))
-    unique_tags = list(set([tag for token,tag in training_data]))
-    emis_prob_array  = np.zeros((len(types),len(unique_tags)))
-    for type_ind,type in enumerate(types):
-        relevant_unique_tags = tuple(set([tag for token,tag in training_data if token == type]))
-        for tag in relevant_unique_tags:
-            tag_ind = unique_tags.index(tag)
-            emis_prob_array[type_ind,tag_ind] = get_emission_probability_base(type,tag,training_data)
-    return pd.DataFrame(emis_prob_array,index=types,columns=unique_tags)
-
-def get_transition_probability(training_sentences:list) -> pd.DataFrame:
+    Returns:
+        Tuple with two elements. The first element is a NumPy array with the counts, whose rows represent the first and whose columns represent the second tag. The second element is a dictionary mapping every tag to its index with *<S>* and *<E>* being the last two indices.
+    '''
+    tags_ind = {} if tags_ind is None else tags_ind.copy()
+    tag_ids = []
+    for sent in training_sentences:
+        tag_ids.append(-2)
+        tag_ids.extend([tags_ind.setdefault(tag,len(tags_ind)) for token,tag in sent])
+        tag_ids.append(-1)
+    tags_num = len(tags_ind)
+    tags_ind["<S>"] = len(tags_ind)
+    tags_ind["<E>"] = len(tags_ind)
+    #Negative indices refer to the last two indices, namely <S> and <E>.
+    tag_ids = np.array(tag_ids,dtype=np.int64) % len(tags_ind)
+    return count_tag_bigrams(tag_ids,tags_num),tags_ind
+
+def count_tag_bigrams(framed_tag_ids:np.ndarray,tags_num:int) -> np.ndarray:
+    '''Counts every bigram of encoded (POS) tags inside sentences.
+
+    Args:
+        framed_tag_ids: NumPy array with the tag indices of sentences one after another, each of them framed by **tags_num** (*<S>*) and **tags_num**+1 (*<E>*).
+        tags_num: Integer representing the number of tags without *<S>* and *<E>*.
+
+    Returns:
+        NumPy array with the counts (see `get_transition_counts`).
+    '''
+    end = tags_num+1
+    #Only keep bigrams inside a sentence (skip <E> followed by the next <S>).
+    tag1_ids = framed_tag_ids[:-1]
+    tag2_ids = framed_tag_ids[1:]
+    inside_sent = tag1_ids != end
+    counts = np.zeros((tags_num+2,tags_num+2),dtype=np.int64)
+    np.add.at(counts,(tag1_ids[inside_sent],tag2_ids[inside_sent]),1)
+    return counts
+
+def get_transition_matrix(training_sentences:list,tags_ind:dict[str,int]|None=None) -> tuple[np.ndarray,dict[str,int]]:
+    '''Creates a NumPy array with transition probabilities.
+
+    Returns a NumPy array containing the transition probability of every pair of unique (POS) tags including the pseudo tags *<S>* and *<E>* given a list of **training_sentences** together with the dictionary mapping tags to their indices (see `get_transition_counts`).
+
+    Args:
+        training_sentences: List containing lists representing sentences. Each list contains tuples representing token-tag-pairs used to train a model.
+        tags_ind: Dictionary mapping unique (POS) tags to indices. By default, **tags_ind** is None and a new dictionary is created.
+
+    Returns:
+        Tuple with two elements. The first element is a NumPy array with transition probabilities, whose rows represent the first and whose columns represent the second tag. The second element is a dictionary mapping every tag to its index.
+    '''
+    counts,tags_ind = get_transition_counts(training_sentences,tags_ind)
+    return get_transition_values(counts),tags_ind
+
+def get_transition_values(counts:np.ndarray) -> np.ndarray:
+    '''Divides the counts of bigrams of (POS) tags **counts** (see `get_transition_counts`) by the counts of their first tag.
+
+    Args:
+        counts: NumPy array with the counts of bigrams of tags.
+
+    Returns:
+        NumPy array with transition probabilities.
+    '''
+    #P(tag2|tag1) = C(<tag1,tag2>)/C(<tag1,X>)
+    tag1_counts = counts.sum(axis=1,keepdims=True)
+    #The row of <E> (and of tags not occurring in the training data) has no bigrams and remains zero.
+    return np.divide(counts,tag1_counts,out=np.zeros(counts.shape),where=tag1_counts > 0)
+
+def get_transition_probability(training_sentences:list) -> "pd.DataFrame":
     '''Creates a pandas data frame with transition probabilities.
 
     Return a pandas data frame containing the transition probability of every pair of unique (POS) tags including the pseudo tags *<S>* and *<E>* given a list of **training_sentences**. In the final data frame, the rows represent the first and the columns the second tag.
@@ -138,46 +432,9 @@ def get_transition_probability(training_sentences:list) -> pd.DataFrame:
     Returns:
         Pandas data frame with transition probabilities. Rows and columns represent unique (POS) tags.
     '''
-
-    def get_transition_probability_base(tag1:str,tag2:str,training_data:list) -> float:
-        '''Returns the transition probability.
-
-        Returns a float representing the transition probability of a tag **tag2** given its previous tag **tag1** from a list of token-tag-pairs **training_data**.
-        
-        Args:
-            tag1: String representing the preceding tag.
-            tag2: String representing the following tag.
-            training_data:  List with tuples representing token-tag-pairs to train a model.
-
-        Returns:
-            Float representing the transition probability.
-        '''
-        #P(tag2|tag1) = C(<tag1,tag2>)/C(<tag1,X>)
-        tags = [tag for token,tag in training_data]
-        count_tag1_tag2 = 0
-        for ind in range(len(tags)-1):
-            if (tags[ind] == tag1) & (tags[ind+1] == tag2):
-                count_tag1_tag2 += 1
-        count_tag1_x = len([tag for tag in tags if tag == tag1])
-        return count_tag1_tag2/count_tag1_x
-
-    new_sentences = [sent.copy() for sent in training_sentences]
-    for sent in new_sentences:
-        sent.insert(0,("<S>","<S>"))
-        sent.append(("<E>","<E>"))
-    new_data = reduce_dim(new_sentences)
-    unique_tags = list(set([tag for token,tag in new_data]))
-    trans_prob_array = np.zeros((len(unique_tags),len(unique_tags)))
-    for ind1,t1 in enumerate(unique_tags):
-        for ind2,t2 in enumerate(unique_tags):
-            if t1 == "<E>":
-                trans_prob_array[ind1,ind2] = 0
-            elif t2 == "<S>":
-                trans_prob_array[ind1,ind2] = 0
-            else:
-                trans_p = get_transition_probability_base(t1,t2,new_data)
-                trans_prob_array[ind1,ind2] = trans_p
-    return pd.DataFrame(trans_prob_array,columns=unique_tags,index=unique_tags)
+    trans_prob_array,tags_ind = get_transition_matrix(training_sentences)
+    import pandas as pd
+    return pd.DataFrame(trans_prob_array,columns=list(tags_ind),index=list(tags_ind))
 
 def get_most_frequent_tag(training_data:list) -> str:
     '''Get the most frequently occuring tag in **training_data**.
@@ -188,15 +445,398 @@ def get_most_frequent_tag(training_data:list) -> str:
     Returns:
         String representing the most frequently occuring tag.
     '''
-    unique_tags = list(set([tag for token,tag in training_data]))
-    tag_freq = []
-    for tag in unique_tags:
-        freq = len([t for tok,t in training_data if t == tag])
-        tag_freq.append((tag,freq))
-    most_frequent_tag = max(tag_freq,key=itemgetter(1))[0]
-    return most_frequent_tag
+    #Count every tag in one pass (ties go to the tag occurring first).
+    return Counter([tag for token,tag in training_data]).most_common(1)[0][0]
+
+def train_hmm(train_sentences:list) -> dict:
+    '''Trains an HMM.
+
+    Creates the emission (as a sparse matrix, see `get_sparse_emission_matrix`) and transition probabilities of an HMM based on **train_sentences** and collects them together with their natural logarithms, the indices of types and tags and the most frequently occuring tag in a dictionary.
+
+    Args:
+        train_sentences: List containing lists representing sentences. Each list contains tuples representing token-tag-pairs. The whole list represents the training data.
+
+    Returns:
+        Dictionary with ten keys: *emis_indptr*, *emis_tags* and *emis_values* (NumPy arrays of the sparse emission probabilities; rows represent types, columns represent tags), *log_emis_values* (natural logarithms of *emis_values*), *trans_p* (NumPy array with transition probabilities; rows and columns represent tags including *<S>* and *<E>* as the last two), *log_trans_p* (natural logarithms of *trans_p* with -inf for impossible events), *vocabulary* (vocabulary mapping types to rows of the emission probabilities), *tags_ind* (dictionary mapping tags to columns of the emission probabilities and rows/columns of *trans_p*), *most_frequent_tag* (index of the most frequently occuring tag) and *model_hash* (hash of the model, see `get_model_hash`).
+    '''
+    train_data = reduce_dim(train_sentences)
+    type_ids,tag_ids,vocabulary,tags_ind = get_emission_ids(train_data)
+    emis_csr = get_sparse_emission_values(type_ids,tag_ids,len(vocabulary),len(tags_ind))
+    #The most frequently occuring tag from the same encoded tags (ties go to the tag occurring first).
+    most_frequent_tag = int(np.bincount(tag_ids,minlength=len(tags_ind)).argmax())
+    #Share the tag indices, so that the first columns of the transition probabilities match the columns of the emission probabilities.
+    trans_p,tags_ind = get_transition_matrix(train_sentences,tags_ind)
+    return build_hmm(emis_csr,trans_p,vocabulary,tags_ind,most_frequent_tag)
+
+def get_first_occurrence_map(ids:np.ndarray,ids_num:int,missing:int) -> tuple[np.ndarray,np.ndarray]:
+    '''Renumbers ids in the order of their first occurrence.
+
+    Args:
+        ids: NumPy array with integer ids between 0 and **ids_num** (exclusive).
+        ids_num: Integer representing the number of possible ids.
+        missing: Integer used as the new id of the ids not occurring in **ids**.
+
+    Returns:
+        Tuple with two NumPy arrays. The first array maps every possible id to its new id. The second array contains the ids occurring in **ids** in the order of their first occurrence (i.e. it maps every new id back to the old one).
+    '''
+    unique_ids,first_inds = np.unique(ids,return_index=True)
+    order = unique_ids[np.argsort(first_inds)]
+    id_map = np.full(ids_num,missing,dtype=np.int32)
+    id_map[order] = np.arange(len(order))
+    return id_map,order
+
+def train_hmm_corpus(corpus:Corpus,sent_inds:np.ndarray) -> tuple[dict,np.ndarray,np.ndarray]:
+    '''Trains an HMM on the sentences of a corpus.
+
+    Trains an HMM like `train_hmm` on the sentences with the indices **sent_inds** in **corpus**. The sentences are not copied: the tokens and tags are selected and framed with index arrays and counted directly. Types and tags are numbered in the order of their first occurrence in the selected sentences, so the model is the same as the one returned by `train_hmm` for these sentences.
+
+    Args:
+        corpus: Corpus containing the training data.
+        sent_inds: NumPy array with the indices of the training sentences.
+
+    Returns:
+        Tuple with three elements. The first element is a dictionary representing the trained HMM (see `train_hmm`). The second element is a NumPy array mapping the type ids of **corpus** to the ids of the model's vocabulary (**Vocabulary.UNK_ID** for types not occurring in the training data). The third element is a NumPy array mapping the tag ids of **corpus** to the tag indices of the model (-1 for tags not occurring in the training data).
+    '''
+    with profiler.phase("emission"):
+        token_inds = corpus.get_token_indices(sent_inds)
+        type_map,types_order = get_first_occurrence_map(corpus.token_ids[token_inds],len(corpus.types),Vocabulary.UNK_ID)
+        tag_map,tags_order = get_first_occurrence_map(corpus.tag_ids[token_inds],len(corpus.tags),-1)
+        type_ids = type_map[corpus.token_ids[token_inds]]
+        tag_ids = tag_map[corpus.tag_ids[token_inds]]
+        emis_csr = get_sparse_emission_values(type_ids,tag_ids,len(types_order),len(tags_order))
+        vocabulary = Vocabulary([corpus.types[type_id] for type_id in types_order.tolist()])
+        tags_ind = {corpus.tags[tag_id]:ind for ind,tag_id in enumerate(tags_order.tolist())}
+        most_frequent_tag = int(np.bincount(tag_ids,minlength=len(tags_order)).argmax())
+    with profiler.phase("transition"):
+        #Frame the sentences with <S> and <E>, which follow the tags of the training data.
+        framed_tag_map = np.append(tag_map,[len(tags_order),len(tags_order)+1])
+        framed_tag_ids = framed_tag_map[corpus.get_framed_tag_ids(sent_inds,len(corpus.tags),len(corpus.tags)+1)]
+        trans_p = get_transition_values(count_tag_bigrams(framed_tag_ids,len(tags_order)))
+        tags_ind["<S>"] = len(tags_ind)
+        tags_ind["<E>"] = len(tags_ind)
+        model = build_hmm(emis_csr,trans_p,vocabulary,tags_ind,most_frequent_tag)
+    return model,type_map,tag_map
+
+def get_corpus_counts(corpus:Corpus,sent_inds:np.ndarray) -> tuple[tuple[np.ndarray,np.ndarray],np.ndarray]:
+    '''Counts the token-tag-pairs and bigrams of tags of sentences of a corpus.
+
+    Counts every token-tag-pair and every bigram of (POS) tags inside the sentences with the indices **sent_inds** in **corpus** using the type and tag ids of **corpus**. The counts are additive: the counts of several disjoint sets of sentences sum up to the counts of their union, so a model for any union of them can be derived without counting again (see `add_pair_counts` and `build_hmm_counts`). The token-tag-pairs are counted sparsely, since only few of all pairs of types and tags occur.
+
+    Args:
+        corpus: Corpus containing the sentences.
+        sent_inds: NumPy array with the indices of the sentences.
+
+    Returns:
+        Tuple with two elements. The first element is a tuple with two NumPy arrays: the sorted ids of the token-tag-pairs occurring in the sentences (type id times the number of tags of **corpus** plus tag id) and their counts. The second element is a NumPy array with the counts of the bigrams of tags (see `get_transition_counts`) with *<S>* and *<E>* following the tags of **corpus**.
+    '''
+    tags_num = len(corpus.tags)
+    with profiler.phase("emission"):
+        token_inds = corpus.get_token_indices(sent_inds)
+        pairs = corpus.token_ids[token_inds].astype(np.int64)*tags_num+corpus.tag_ids[token_inds]
+        emis_counts = np.unique(pairs,return_counts=True)
+    with profiler.phase("transition"):
+        trans_counts = count_tag_bigrams(corpus.get_framed_tag_ids(sent_inds,tags_num,tags_num+1),tags_num)
+    return emis_counts,trans_counts
+
+def add_pair_counts(pairs:np.ndarray,counts:np.ndarray,other_pairs:np.ndarray,other_counts:np.ndarray,sign:int=1) -> np.ndarray:
+    '''Returns a copy of the counts **counts** of the sorted pair ids **pairs** plus (or minus, if **sign** is -1) the counts **other_counts** of the pair ids **other_pairs**, which must all occur in **pairs** (see `get_corpus_counts`).'''
+    counts = counts.copy()
+    update = np.add if sign == 1 else np.subtract
+    update.at(counts,np.searchsorted(pairs,other_pairs),other_counts)
+    return counts
+
+def build_hmm_counts(corpus:Corpus,emis_counts:tuple[np.ndarray,np.ndarray],trans_counts:np.ndarray) -> tuple[dict,np.ndarray,np.ndarray]:
+    '''Trains an HMM on counts of a corpus.
+
+    Creates an HMM (see `train_hmm`) from the sparse counts of token-tag-pairs **emis_counts** and the counts of bigrams of tags **trans_counts** of sentences of **corpus** (see `get_corpus_counts`). Pairs, types and tags with a count of 0 are left out of the model, so they are unknown to it. The remaining types and tags keep the order of their ids in **corpus**.
+
+    Args:
+        corpus: Corpus the counts are based on.
+        emis_counts: Tuple with two NumPy arrays: the sorted ids of the token-tag-pairs and their counts.
+        trans_counts: NumPy array with the counts of the bigrams of tags.
+
+    Returns:
+        Tuple with three elements (see `train_hmm_corpus`).
+    '''
+    with profiler.phase("emission"):
+        pairs,counts = emis_counts
+        occurring = counts > 0
+        pair_type_ids,pair_tag_ids = np.divmod(pairs[occurring],len(corpus.tags))
+        counts = counts[occurring]
+        type_counts = np.bincount(pair_type_ids,weights=counts,minlength=len(corpus.types))
+        tag_counts = np.bincount(pair_tag_ids,weights=counts,minlength=len(corpus.tags))
+        types_order = np.flatnonzero(type_counts)
+        tags_order = np.flatnonzero(tag_counts)
+        type_map = np.full(len(corpus.types),Vocabulary.UNK_ID,dtype=np.int32)
+        type_map[types_order] = np.arange(len(types_order))
+        tag_map = np.full(len(corpus.tags),-1,dtype=np.int32)
+        tag_map[tags_order] = np.arange(len(tags_order))
+        #Sparse emission probabilities (see `get_sparse_emission_values`). The pairs are sorted by type first and tag second,
+        #which the renumbering keeps, since it keeps the order of the ids.
+        pair_type_ids = type_map[pair_type_ids].astype(np.int64)
+        pair_tag_ids = tag_map[pair_tag_ids].astype(np.int64)
+        indptr = np.zeros(len(types_order)+1,dtype=np.int64)
+        np.cumsum(np.bincount(pair_type_ids,minlength=len(types_order)),out=indptr[1:])
+        #P(word|tag) = C(<tag,word>)/C(<tag,X>)
+        emis_csr = {"indptr": indptr,
+                    "tags": pair_tag_ids,
+                    "values": counts/tag_counts[tags_order][pair_tag_ids]}
+        vocabulary = Vocabulary([corpus.types[type_id] for type_id in types_order.tolist()])
+        tags_ind = {corpus.tags[tag_id]:ind for ind,tag_id in enumerate(tags_order.tolist())}
+        most_frequent_tag = int(tag_counts[tags_order].argmax())
+    with profiler.phase("transition"):
+        #Keep <S> and <E> as the last two tags.
+        framed_tags_order = np.append(tags_order,[len(corpus.tags),len(corpus.tags)+1])
+        trans_p = get_transition_values(trans_counts[np.ix_(framed_tags_order,framed_tags_order)])
+        tags_ind["<S>"] = len(tags_ind)
+        tags_ind["<E>"] = len(tags_ind)
+        model = build_hmm(emis_csr,trans_p,vocabulary,tags_ind,most_frequent_tag)
+    return model,type_map,tag_map
+
+def build_hmm(emis_csr:dict[str,np.ndarray],trans_p:np.ndarray,vocabulary:Vocabulary,tags_ind:dict[str,int],most_frequent_tag:int) -> dict:
+    '''Collects the parts of a trained HMM in a dictionary (see `train_hmm`) and adds the logarithms of the probabilities.
+
+    Args:
+        emis_csr: Dictionary with the sparse emission probabilities (see `get_sparse_emission_matrix`).
+        trans_p: NumPy array with transition probabilities.
+        vocabulary: Vocabulary mapping types to rows of the emission probabilities.
+        tags_ind: Dictionary mapping tags to their indices.
+        most_frequent_tag: Integer representing the index of the most frequently occuring tag.
+
+    Returns:
+        Dictionary representing a trained HMM (see `train_hmm`).
+    '''
+    #Probabilities of 0 become -inf.
+    with np.errstate(divide="ignore"):
+        log_trans_p = np.log(trans_p)
+    model = {"emis_indptr": emis_csr["indptr"],
+             "emis_tags": emis_csr["tags"],
+             "emis_values": emis_csr["values"],
+             "log_emis_values": np.log(emis_csr["values"]),
+             "trans_p": trans_p,
+             "log_trans_p": log_trans_p,
+             "vocabulary": vocabulary,
+             "tags_ind": tags_ind,
+             "most_frequent_tag": most_frequent_tag}
+    #Hash the model once, so that the decode cache does not hash its arrays on every lookup (see `viterbi_algorithm_cached`).
+    model["model_hash"] = get_model_hash(model)
+    return model
+
+def get_scoring(model:dict,log_space:bool=False) -> tuple[np.ndarray,float,float,np.ufunc]:
+    '''Returns how the Viterbi algorithm scores sequences with a trained **model** (see `viterbi_algorithm`).
+
+    Args:
+        model: Dictionary representing a trained HMM (see `train_hmm`).
+        log_space: Boolean indicating whether to score sequences with the sum of log probabilities instead of the product of probabilities.
+
+    Returns:
+        Tuple with four elements: the transition probabilities (their logarithms, if **log_space** is True), the score of impossible sequences, the score of an empty sequence and the function combining two scores (multiplying probabilities or adding their logarithms).
+    '''
+    if log_space:
+        return model["log_trans_p"],-np.inf,0,np.add
+    return model["trans_p"],0,1,np.multiply
+
+def viterbi_algorithm(sent_ids:np.ndarray,model:dict,log_space:bool=False) -> list[int]|None:
+    '''Computes the optimal sequence of (POS) tags for a sentence.
+
+    This is the reference implementation decoding one sentence at a time, which the batch decoder `viterbi_algorithm_batch` is checked against. Use `viterbi_algorithm_batch` to decode sentences.
+
+    Applies the Viterbi algorithm to a sentence **sent_ids** given a trained **model** (see `train_hmm`). Keeps a matrix with the best probability of every tag at every position of the sentence and a matrix with the index of the previous tag belonging to it (backpointer). Every position is computed in one step for all pairs of previous tags and current tags, which can emit the token (see `get_candidate_tags`); all other tags are skipped. Out-of-vocabulary tokens get the most frequently occuring tag of the training data, which continues the best sequence so far without changing its probability. In the end, the optimal sequence is retrieved by following the backpointers from the last to the first position.
+
+    By default, probabilities are multiplied. Their product may underflow to 0 for long sentences, which makes the sentence unpredictable. If **log_space** is True, the logarithms of the probabilities are added instead, which cannot underflow.
+
+    Args:
+        sent_ids: NumPy array with the id (see `Vocabulary`) of every token of a sentence. Out-of-vocabulary tokens are represented by **Vocabulary.UNK_ID**.
+        model: Dictionary representing a trained HMM (see `train_hmm`).
+        log_space: Boolean indicating whether to score sequences with the sum of log probabilities instead of the product of probabilities.
+
+    Returns:
+        List with the indices of the predicted (POS) tags or None, if no sequence with a probability greater than 0 exists.
+    '''
+    trans_p,impossible,certain,combine = get_scoring(model,log_space)
+    tags_num = len(model["tags_ind"])-2
+    start = model["tags_ind"]["<S>"]
+    end = model["tags_ind"]["<E>"]
+    scores = np.full((len(sent_ids),tags_num),impossible,dtype=np.float64)
+    backpointers = np.zeros((len(sent_ids),tags_num),dtype=np.int64)
+    for n,type_ind in enumerate(sent_ids):
+        if type_ind == Vocabulary.UNK_ID:
+            #Continue the best sequence so far with the most frequently occuring tag.
+            if n == 0:
+                scores[n,model["most_frequent_tag"]] = certain
+            else:
+                best_prev_tag = scores[n-1].argmax()
+                scores[n,model["most_frequent_tag"]] = scores[n-1,best_prev_tag]
+                backpointers[n,model["most_frequent_tag"]] = best_prev_tag
+        else:
+            cand_tags,emis_p = get_candidate_tags(model,type_ind,log_space)
+            if n == 0:
+                scores[n,cand_tags] = combine(emis_p,trans_p[start,cand_tags])
+            else:
+                #Probabilities of all sequences: rows represent the previous, columns the current (candidate) tag.
+                seqs_p = combine(combine(scores[n-1][:,None],emis_p),trans_p[:tags_num,cand_tags])
+                best_prev_tags = seqs_p.argmax(axis=0)
+                backpointers[n,cand_tags] = best_prev_tags
+                scores[n,cand_tags] = seqs_p[best_prev_tags,np.arange(len(cand_tags))]
+        if profiler.memory:
+            profiler.count_live_paths(n,np.array([(scores[n] != impossible).sum()]))
+        #Stop, if no sequence with a probability greater than 0 is left.
+        if (scores[n] == impossible).all():
+            return None
+    #Include the end tag <E> and pick out the tag ending the sequence with the highest probability.
+    end_p = combine(scores[-1],trans_p[:tags_num,end])
+    best_tag = end_p.argmax()
+    if end_p[best_tag] == impossible:
+        return None
+    #Follow the backpointers to get the optimal sequence.
+    optimal_seq = [int(best_tag)]
+    for n in range(len(sent_ids)-1,0,-1):
+        optimal_seq.append(int(backpointers[n,optimal_seq[-1]]))
+    optimal_seq.reverse()
+    return optimal_seq
+
+def viterbi_algorithm_batch(sents_ids:list[np.ndarray],model:dict,log_space:bool=False,batch_size:int=64,cache:DecodeCache|None=None,return_lengths:bool=False) -> list[list[int]|None]|tuple[list[list[int]|None],list[int]]:
+    '''Computes the optimal sequences of (POS) tags for many sentences at once.
+
+    Applies the Viterbi algorithm (see `viterbi_algorithm`) to all sentences **sents_ids** given a trained **model**. The sentences are sorted by their length and split into batches of **batch_size** sentences. The sentences of a batch are padded to the same length and advanced one position per step for all sentences at once. Padded positions keep the scores of the last token and point back to the same tag. The results are identical to applying `viterbi_algorithm` to every sentence.
+
+    If a **cache** is given, only sentences without a cached sequence for the same model are decoded (see `viterbi_algorithm_cached`).
+
+    Args:
+        sents_ids: List containing NumPy arrays with the id (see `Vocabulary`) of every token of a sentence. Out-of-vocabulary tokens are represented by **Vocabulary.UNK_ID**.
+        model: Dictionary representing a trained HMM (see `train_hmm`).
+        log_space: Boolean indicating whether to score sequences with the sum of log probabilities instead of the product of probabilities.
+        batch_size: Integer representing the maximal number of sentences decoded at once. Bounds the memory needed for the scores of every pair of tags (**batch_size** x tags x tags).
+        cache: Decode cache. By default, **cache** is None indicating that every sentence is decoded.
+        return_lengths: Boolean indicating whether to return the decoded lengths of the sentences as well.
+
+    Returns:
+        List with a list of indices of the predicted (POS) tags or None (if no sequence with a probability greater than 0 exists) for every sentence in the order of **sents_ids**. If **return_lengths** is True, a tuple with this list and a list with the decoded length of every sentence: the number of its tokens decoded until no sequence with a probability greater than 0 is left (its length, if sequences are left at its last token).
+    '''
+    if cache is not None:
+        return viterbi_algorithm_cached(sents_ids,model,cache,log_space,batch_size,return_lengths)
+    trans_p,impossible,certain,combine = get_scoring(model,log_space)
+    tags_num = len(model["tags_ind"])-2
+    start = model["tags_ind"]["<S>"]
+    end = model["tags_ind"]["<E>"]
+    most_frequent_tag = model["most_frequent_tag"]
+    tags_trans_p = trans_p[:tags_num,:tags_num]
+    #Empty sentences are not decoded: they get an empty sequence, if the transition from <S> to <E> is possible.
+    empty_seq = [] if trans_p[start,end] != impossible else None
+    optimal_seqs = [empty_seq if len(sent_ids) == 0 else None for sent_ids in sents_ids]
+    decoded_lengths = [len(sent_ids) for sent_ids in sents_ids]
+    #Sort the (non-empty) sentences by their length to reduce the amount of padding.
+    order = sorted([ind for ind,sent_ids in enumerate(sents_ids) if len(sent_ids)],key=lambda ind: len(sents_ids[ind]))
+    for batch_start in range(0,len(order),batch_size):
+        batch = order[batch_start:batch_start+batch_size]
+        lengths = np.array([len(sents_ids[ind]) for ind in batch])
+        max_len = lengths.max()
+        #Pad the sentences with the id of out-of-vocabulary tokens.
+        ids = np.full((len(batch),max_len),Vocabulary.UNK_ID,dtype=np.int32)
+        for row,ind in enumerate(batch):
+            ids[row,:lengths[row]] = sents_ids[ind]
+        mask = np.arange(max_len) < lengths[:,None]
+        oov = (ids == Vocabulary.UNK_ID) & mask
+        rows = np.arange(len(batch))
+        backpointers = np.zeros((len(batch),max_len,tags_num),dtype=np.int64)
+        #Dense emission probabilities of every token in the batch: (sentences x positions x tags).
+        emis_rows = get_emission_rows(model,ids.reshape(-1),log_space).reshape((len(batch),max_len,tags_num))
+        #First position: transition from <S>.
+        scores = combine(emis_rows[:,0],trans_p[start,:tags_num])
+        scores[oov[:,0]] = impossible
+        scores[oov[:,0],most_frequent_tag] = certain
+        #Sentences without a sequence with a probability greater than 0 and the number of their decoded tokens.
+        lost = (scores == impossible).all(axis=1)
+        batch_decoded_lengths = np.where(lost,1,lengths)
+        if profiler.memory:
+            profiler.count_live_paths(0,(scores != impossible).sum(axis=1))
+        for n in range(1,max_len):
+            #Probabilities of all sequences: (sentences x previous tags x current tags).
+            seqs_p = combine(combine(scores[:,:,None],emis_rows[:,n,None,:]),tags_trans_p)
+            new_backpointers = seqs_p.argmax(axis=1)
+            new_scores = np.take_along_axis(seqs_p,new_backpointers[:,None,:],axis=1)[:,0,:]
+            #Out-of-vocabulary tokens continue the best sequence so far with the most frequently occuring tag.
+            best_prev_tags = scores[oov[:,n]].argmax(axis=1)
+            new_scores[oov[:,n]] = impossible
+            new_scores[oov[:,n],most_frequent_tag] = scores[oov[:,n]][np.arange(len(best_prev_tags)),best_prev_tags]
+            new_backpointers[oov[:,n],most_frequent_tag] = best_prev_tags
+            #Padded positions keep their scores and point back to the same tag.
+            padded = ~mask[:,n]
+            new_scores[padded] = scores[padded]
+            new_backpointers[padded] = np.arange(tags_num)
+            scores = new_scores
+            backpointers[:,n] = new_backpointers
+            newly_lost = mask[:,n] & ~lost & (scores == impossible).all(axis=1)
+            batch_decoded_lengths[newly_lost] = n+1
+            lost |= newly_lost
+            if profiler.memory:
+                #Number of tags with a probability greater than 0 (live paths) of the sentences having a token at this position.
+                profiler.count_live_paths(n,(scores[mask[:,n]] != impossible).sum(axis=1))
+        #Include the end tag <E> and pick out the tag ending the sequence with the highest probability.
+        end_p = combine(scores,trans_p[:tags_num,end])
+        best_tags = end_p.argmax(axis=1)
+        possible = end_p[rows,best_tags] != impossible
+        #Follow the backpointers to get the optimal sequences.
+        paths = np.zeros((len(batch),max_len),dtype=np.int64)
+        paths[:,-1] = best_tags
+        for n in range(max_len-1,0,-1):
+            paths[:,n-1] = backpointers[rows,n,paths[:,n]]
+        for row,ind in enumerate(batch):
+            decoded_lengths[ind] = int(batch_decoded_lengths[row])
+            if possible[row]:
+                optimal_seqs[ind] = paths[row,:lengths[row]].tolist()
+    if return_lengths:
+        return optimal_seqs,decoded_lengths
+    return optimal_seqs
+
+def viterbi_algorithm_cached(sents_ids:list[np.ndarray],model:dict,cache:DecodeCache,log_space:bool=False,batch_size:int=64,return_lengths:bool=False) -> list[list[int]|None]|tuple[list[list[int]|None],list[int]]:
+    '''Computes the optimal sequences of (POS) tags for many sentences with a cache.
+
+    Looks up the sequence of every sentence in **sents_ids** decoded with **model** in **cache**. The key of a sentence contains the hash of the model (see `get_model_hash`), so a cached sequence is only reused by an identical model. The sentences missing in the cache are decoded at once (see `viterbi_algorithm_batch`), repeated sentences only once, and added to the cache.
+
+    Args:
+        sents_ids: List containing NumPy arrays with the id (see `Vocabulary`) of every token of a sentence.
+        model: Dictionary representing a trained HMM (see `train_hmm`).
+        cache: Decode cache.
+        log_space: Boolean indicating whether to score sequences with the sum of log probabilities instead of the product of probabilities.
+        batch_size: Integer representing the maximal number of sentences decoded at once.
+        return_lengths: Boolean indicating whether to return the decoded lengths of the sentences as well.
+
+    Returns:
+        List with a list of indices of the predicted (POS) tags or None for every sentence in the order of **sents_ids**, and, if **return_lengths** is True, a list with the decoded length of every sentence (see `viterbi_algorithm_batch`).
+    '''
+    #Models built by `build_hmm` or loaded by `load_model` are hashed once. Other models are hashed here once.
+    if "model_hash" not in model:
+        model["model_hash"] = get_model_hash(model)
+    model_hash = model["model_hash"]
+    optimal_seqs = [None] * len(sents_ids)
+    decoded_lengths = [0] * len(sents_ids)
+    #Indices of the sentences missing in the cache per key.
+    missing = {}
+    for ind,sent_ids in enumerate(sents_ids):
+        key = cache.get_key(model_hash,sent_ids,log_space)
+        if key in missing:
+            #Repeated sentences are only decoded once, so they count as hits.
+            missing[key].append(ind)
+            cache.hits += 1
+            continue
+        found,optimal_seq,decoded_length = cache.get(key)
+        if found:
+            optimal_seqs[ind] = optimal_seq
+            decoded_lengths[ind] = decoded_length
+        else:
+            missing[key] = [ind]
+    decoded_seqs,missing_lengths = viterbi_algorithm_batch([sents_ids[inds[0]] for inds in missing.values()],model,log_space,batch_size,return_lengths=True)
+    for (key,inds),optimal_seq,decoded_length in zip(missing.items(),decoded_seqs,missing_lengths):
+        cache.put(key,optimal_seq,decoded_length)
+        for ind in inds:
+            optimal_seqs[ind] = None if optimal_seq is None else list(optimal_seq)
+            decoded_lengths[ind] = decoded_length
+    if return_lengths:
+        return optimal_seqs,decoded_lengths
+    return optimal_seqs
 
-def hmm_and_viterbi_algorithm(train_sentences:list,test_sentences:list) -> tuple[float,float]:
+def hmm_and_viterbi_algorithm(train_sentences:list,test_sentences:list,log_space:bool=False,batch_size:int=64) -> tuple[float,float,float,float]:
     '''Initializes, trains and tests a tagger.
 
     Creates and trains an HMM based on **train_sentences**. The model is used as a tagger, which is tested on **test_sentences** using the Viterbi algorithm.
@@ -204,207 +844,380 @@ def hmm_and_viterbi_algorithm(train_sentences:list,test_sentences:list) -> tuple
     Args:
         train_sentences: List containing lists representing sentences. Each list contains tuples representing token-tag-pairs. The whole list represents the training data.
         test_sentences: List containing lists representing sentences. Each list contains tuples representing token-tag-pairs. The whole list represents the test data.
+        log_space: Boolean indicating whether the Viterbi algorithm scores sequences in log space (see `viterbi_algorithm`).
+        batch_size: Integer representing the maximal number of test sentences decoded at once (see `viterbi_algorithm_batch`).
 
     Returns:
-        Tuple with three floats. The first float represents the tagger's accuracy correctly predicting a sequence of tags (sentence). The second float represents the tagger's accuracy correctly predicting single tags (token). The third float represents the average number of tokens appearing in the test but not in the training data.
+        Tuple with four floats. The first float represents the tagger's accuracy correctly predicting a sequence of tags (sentence). The second float represents the tagger's accuracy correctly predicting single tags (token). The third float represents the average number of tokens appearing in the test but not in the training data. The fourth float represents the average number of test sentences, which could not be predicted, because the probabilities underflowed to 0 (always 0, if **log_space** is True).
     '''
+    #Encode the sentences compactly and use the indices of the training and test sentences.
+    corpus = Corpus(train_sentences+test_sentences)
+    train_inds = np.arange(len(train_sentences))
+    test_inds = np.arange(len(train_sentences),len(corpus))
+    return hmm_and_viterbi_algorithm_corpus(corpus,train_inds,test_inds,log_space,batch_size)
 
-    def get_optimal_seq(seqs_probs:dict,seqs_key:str="seqs",probs_key:str="probs") -> tuple:
-        '''Gets the best sequence and probability.
-
-        Returns the optimal sequence and its probability as a tuple based on a dict **seqs_probs** containing i) a list of sequences of (POS) tags as a value for the key **seqs_key** and ii) a list of associated computed probabilities as a value for the key **probs_key**.
+def hmm_and_viterbi_algorithm_corpus(corpus:Corpus,train_inds:np.ndarray,test_inds:np.ndarray,log_space:bool=False,batch_size:int=64,cache:DecodeCache|None=None) -> tuple[float,float,float,float]:
+    '''Initializes, trains and tests a tagger on the sentences of a corpus.
 
-        Args:
-            seqs_probs: Dictionary with two keys **seqs_key** and **probs_key**. The value of the first key is a list of sequences of (POS) tags (list of lists containing strings). The value of the second key is a list of probabilities (list of floats) belonging to the sequences in **seqs_key**.
-            seqs_key: String to access the list of sequences of POS tags (list of lists containing strings).
-            probs_key: String to access the list of probabilities (list of floats).
+    Creates and trains an HMM based on the sentences with the indices **train_inds** in **corpus** (see `train_hmm_corpus`). The model is used as a tagger, which is tested on the sentences with the indices **test_inds** using the Viterbi algorithm (see `test_hmm_corpus`).
 
-        Returns:
-            Tuple with two elements. The first element is a list of strings representing the optimal sequence of (POS) tags. The second element is a float representing the probability belonging to the optimal sequence.
-        '''
-        optimal_seq = None
-        best_p = 0
-        for n in range(len(seqs_probs[seqs_key])):
-            seq_p = seqs_probs[probs_key][n]
-            seq = seqs_probs[seqs_key][n]
-            if seq_p > best_p:
-                best_p = seq_p
-                optimal_seq = seq
-        return optimal_seq, best_p
+    Args:
+        corpus: Corpus containing the training and test data.
+        train_inds: NumPy array with the indices of the training sentences.
+        test_inds: NumPy array with the indices of the test sentences.
+        log_space: Boolean indicating whether the Viterbi algorithm scores sequences in log space (see `viterbi_algorithm`).
+        batch_size: Integer representing the maximal number of test sentences decoded at once (see `viterbi_algorithm_batch`).
+        cache: Decode cache (see `viterbi_algorithm_cached`). By default, **cache** is None indicating that every sentence is decoded.
 
+    Returns:
+        Tuple with four floats (see `hmm_and_viterbi_algorithm`).
+    '''
     print(f"Training.")
-    #Train the hidden Markov model: Create the data frames for the emission and transition probabilities.
-    trans_p_df = get_transition_probability(train_sentences)
-    train_data = reduce_dim(train_sentences)
-    emis_p_df = get_emission_probability(train_data)
-
-    #Create a vocabulary and list of unique POS tags given the training data.
-    voc = list(emis_p_df.index)
-    tags = list(emis_p_df.columns)
+    #Train the hidden Markov model: Create the arrays for the emission and transition probabilities.
+    model,type_map,tag_map = train_hmm_corpus(corpus,train_inds)
 
     print(f"Testing.")
-    #Counting the number of correctly predicted i) sentences and ii) tokens.
-    sentences_correctly_predicted = 0
-    tokens_correctly_predicted = 0
-    #Counting the number of out of vocabulary tokens.
-    oov = 0
-    most_frequent_tag = get_most_frequent_tag(train_data)
-
-    #Iterate through all test sentences.
-    for sent in test_sentences:
-        #Create a list for sequences and their associated probabilities.
-        seqs_probs = {"seqs": [["<S>"]],
-                      "probs": [1]}
-        #Iterate through pairs of tokens and POS tags in a sentence except for the first and last.
-        for n in range(len(sent)):
-            #Get the token.
-            token = sent[n][0]
-            #Prepare lists for collecting the new best sequences and probabilites.
-            new_seqs = []
-            new_probs = []
-            #If the token does not occur in the training data: Iterate through every sequence and add the most frequently occuring POS tag in the training data to the sequence.
-            if not token in voc:
-                oov += 1
-                best_seq,best_p = get_optimal_seq(seqs_probs)
-                new_seqs.append(best_seq + [most_frequent_tag])
-                new_probs.append(best_p)
-            else:
-                #If the token occurs in the training data: Iterate through all relevant tags.
-                for tag in tags:
-                    #Initialize variables to keep track of the best sequence a POS tag occurs in (backtrack).
-                    best_seq_ind = None
-                    best_p = 0
-                    #Calculate the emission probability (doing it later slows down the code because of repeated computation)
-                    emis_p = emis_p_df.at[token,tag]
-                    #Iterate thorugh every sequence and probability collected so far.
-                    for i in range(len(seqs_probs["seqs"])):
-                        seq = seqs_probs["seqs"][i]
-                        prev_tag = seq[-1]
-                        #Compute the transition probability, get the previous probability and compute the new probability of the sequence.
-                        prev_p = seqs_probs["probs"][i]
-                        trans_p = trans_p_df.at[prev_tag,tag]
-                        seq_p = prev_p * emis_p * trans_p
-                        #Check, whether the new sequence probability is the best so far.
-                        if seq_p > best_p:
-                            best_p = seq_p
-                            best_seq_ind = i
-                    #Get the best sequence, probability and tag, and add it to the list of new sequences and probabilities, if it is positive.
-                    if best_p > 0:
-                        new_seqs.append(seqs_probs["seqs"][best_seq_ind] + [tag])
-                        new_probs.append(best_p)
-            #Before continuing with the next token, update the lists of sequences and probabilities for the next iteration step.
-            seqs_probs["seqs"] = new_seqs
-            seqs_probs["probs"] = new_probs
-            #Check, whether sequences with values greater than 0 are available. If not, break.
-            if not seqs_probs["seqs"]:
-                break
-        #Create empty lists for collecting sequences with probabilities greater than 0.
-        new_seqs = []
-        new_probs = []
-        #Include the end tag <E> into the sequences and then pick out the sequence with the highest computed probability.
-        for n in range(len(seqs_probs["seqs"])):
-            seq = seqs_probs["seqs"][n]
-            prev_tag = seq[-1]
-            trans_p = trans_p_df.at[prev_tag,"<E>"]
-            if trans_p > 0:
-                prev_p = seqs_probs["probs"][n]
-                new_seqs.append(seq)
-                new_probs.append(prev_p * trans_p)
-        #Update the list of sequences and probabilities a last time.
-        seqs_probs["seqs"] = new_seqs
-        seqs_probs["probs"] = new_probs
-        #Check, whether sequences with probabilities greater than 0 remain. If not, continue with the next test sentence.
-        if not seqs_probs["probs"]:
-            continue
-        #Get the sequence with the highest computed probability.
-        optimal_seq = get_optimal_seq(seqs_probs)[0]
-        #Test, whether the predicted sequence of POS tags is correct or not. If so, increase the number of correctly predicted sentences and/or tokens.
-        actual_seq = [tag for token,tag in sent]
-        if optimal_seq[1:] == actual_seq:
-            sentences_correctly_predicted += 1
-            tokens_correctly_predicted += len(sent)
+    return test_hmm_corpus(model,type_map,tag_map,corpus,test_inds,log_space,batch_size,cache)
+
+def test_hmm_corpus(model:dict,type_map:np.ndarray,tag_map:np.ndarray,corpus:Corpus,test_inds:np.ndarray,log_space:bool=False,batch_size:int=64,cache:DecodeCache|None=None) -> tuple[float,float,float,float]:
+    '''Tests a tagger on the sentences of a corpus.
+
+    Tags the sentences with the indices **test_inds** in **corpus** with the trained **model** using the Viterbi algorithm. The test sentences are encoded by mapping the type and tag ids of the corpus to the ids of the model, and the predictions are compared with the actual tags at once for all tokens.
+
+    Args:
+        model: Dictionary representing a trained HMM (see `train_hmm`).
+        type_map: NumPy array mapping the type ids of **corpus** to the ids of the model's vocabulary (see `train_hmm_corpus`).
+        tag_map: NumPy array mapping the tag ids of **corpus** to the tag indices of the model (see `train_hmm_corpus`).
+        corpus: Corpus containing the test data.
+        test_inds: NumPy array with the indices of the test sentences.
+        log_space: Boolean indicating whether the Viterbi algorithm scores sequences in log space (see `viterbi_algorithm`).
+        batch_size: Integer representing the maximal number of test sentences decoded at once (see `viterbi_algorithm_batch`).
+        cache: Decode cache (see `viterbi_algorithm_cached`). By default, **cache** is None indicating that every sentence is decoded.
+
+    Returns:
+        Tuple with four floats (see `hmm_and_viterbi_algorithm`).
+    '''
+    #Get the id of every test token in the model's vocabulary (Vocabulary.UNK_ID, if the token does not occur in the training data)
+    #and the index of its actual tag in the model (-1, if the tag does not occur in the training data).
+    with profiler.phase("decode"):
+        token_inds = corpus.get_token_indices(test_inds)
+        type_ids = type_map[corpus.token_ids[token_inds]]
+        lengths = corpus.lengths[test_inds]
+        sent_starts = np.cumsum(lengths)-lengths
+        sents_ids = np.split(type_ids,sent_starts[1:])
+        #Decode all test sentences in batches.
+        optimal_seqs,decoded_lengths = viterbi_algorithm_batch(sents_ids,model,log_space,batch_size,cache,True)
+        #Counting the number of sentences lost because of probabilities underflowing to 0:
+        #If a sequence exists in log space for a sentence without a sequence, its probability underflowed.
+        underflow = 0
+        if not log_space:
+            lost_sents_ids = [sent_ids for sent_ids,optimal_seq in zip(sents_ids,optimal_seqs) if optimal_seq is None]
+            underflow = sum([optimal_seq is not None for optimal_seq in viterbi_algorithm_batch(lost_sents_ids,model,True,batch_size,cache)])
+
+    with profiler.phase("scoring"):
+        actual_tag_ids = tag_map[corpus.tag_ids[token_inds]]
+        #Count the out-of-vocabulary tokens of every sentence up to the token, after which no sequence with a probability greater than 0 is left,
+        #since decoding a sentence stops there (see `viterbi_algorithm_batch`).
+        positions = np.arange(len(type_ids))-np.repeat(sent_starts,lengths)
+        decoded = positions < np.repeat(decoded_lengths,lengths)
+        oov = int(((type_ids == Vocabulary.UNK_ID) & decoded).sum())
+        #Collect the predicted tags of all test tokens. Tokens of sentences without a sequence with a probability greater than 0 get -2, which never equals an actual tag.
+        predicted_tag_ids = np.concatenate([np.full(length,-2) if optimal_seq is None else optimal_seq for optimal_seq,length in zip(optimal_seqs,lengths)])
+        #Count the number of correctly predicted i) tokens and ii) sentences (all of their tokens are correct).
+        correct = predicted_tag_ids == actual_tag_ids
+        tokens_correctly_predicted = int(correct.sum())
+        #Count the correct tokens per sentence (empty sentences have none). Sentences without a sequence are never correct.
+        correct_per_sent = np.bincount(np.repeat(np.arange(len(lengths)),lengths),weights=correct,minlength=len(lengths))
+        predicted = np.array([optimal_seq is not None for optimal_seq in optimal_seqs],dtype=bool)
+        sentences_correctly_predicted = int(((correct_per_sent == lengths) & predicted).sum())
+        #Calculate the amount of correctly predicted sentences and (word or morph) tokens normalized by the number of predictable elements (sentences and/or tokens), and return both values.
+        sent_pred_accuracy = sentences_correctly_predicted/len(test_inds)
+        tok_pred_accuracy = tokens_correctly_predicted/len(token_inds)
+        oov = oov/len(token_inds)
+        underflow = underflow/len(test_inds)
+    return sent_pred_accuracy,tok_pred_accuracy,oov,underflow
+
+#Corpus and decode cache shared with the worker processes of `run_epochs`.
+worker_corpus = None
+worker_cache = None
+
+def init_worker(corpus:Corpus,cache_mb:float|None=None):
+    '''Shares **corpus** with a worker process of `run_epochs`, which cannot inherit it by forking, and creates the decode cache of the process.
+
+    Args:
+        corpus: Corpus containing the tagged sentences.
+        cache_mb: Float representing the size cap of the decode cache in megabytes (see `DecodeCache`). By default, **cache_mb** is None indicating no cache.
+    '''
+    global worker_corpus, worker_cache
+    worker_corpus = corpus
+    worker_cache = DecodeCache(cache_mb) if cache_mb else None
+
+def run_epoch(epoch:int,epochs:int,sent_inds:np.ndarray,split_num:int,log_space:bool=False,batch_size:int=64) -> tuple[float,float,float,float]:
+    '''Runs one epoch.
+
+    Splits the sentences of the corpus shared by `run_epochs` into training and test data using the permutation **sent_inds** of their indices, trains an HMM and tests it (see `hmm_and_viterbi_algorithm_corpus`). The corpus itself is neither copied nor changed, so the result of an epoch only depends on **sent_inds**.
+
+    Args:
+        epoch: Integer representing the index of the epoch.
+        epochs: Integer representing the number of epochs.
+        sent_inds: NumPy array with a permutation of the indices of the sentences (see `get_epoch_splits`).
+        split_num: Integer representing the number of training sentences, which are the first indices of **sent_inds**.
+        log_space: Boolean indicating whether the Viterbi algorithm scores sequences in log space.
+        batch_size: Integer representing the maximal number of test sentences decoded at once.
+
+    Returns:
+        Tuple with four floats (see `hmm_and_viterbi_algorithm`).
+    '''
+    print(f"Epoch: {epoch+1}/{epochs}")
+    profiler.start_record(f"epoch {epoch+1}")
+    if worker_cache is None:
+        return hmm_and_viterbi_algorithm_corpus(worker_corpus,sent_inds[:split_num],sent_inds[split_num:],log_space,batch_size)
+    hits,misses = worker_cache.hits,worker_cache.misses
+    results = hmm_and_viterbi_algorithm_corpus(worker_corpus,sent_inds[:split_num],sent_inds[split_num:],log_space,batch_size,worker_cache)
+    #Save the hits and misses of the epoch in its record.
+    profiler.records[-1]["cache"] = {"hits": worker_cache.hits-hits,"misses": worker_cache.misses-misses}
+    return results
+
+def run_epoch_profiled(*args) -> tuple[tuple[float,float,float,float],dict]:
+    '''Runs one epoch (see `run_epoch`) and returns its results together with its record of the profiler, which is removed from the profiler of the (worker) process.'''
+    results = run_epoch(*args)
+    return results,profiler.records.pop()
+
+def run_epochs(corpus:Corpus,epochs:int,seed:int|None=None,workers:int=1,size:float=0.8,log_space:bool=False,batch_size:int=64,strata_num:int|None=None,cache_mb:float|None=None) -> list[tuple[float,float,float,float]]:
+    '''Runs several epochs in parallel.
+
+    Runs **epochs** independent epochs (see `run_epoch`) with **workers** processes. Every epoch gets its own seed spawned from one seed sequence initialized with **seed**. The splits of all epochs are created up front from these seeds (see `get_epoch_splits`), so running the epochs in parallel returns the same results as running them one after another. The worker processes get **corpus** once: forked processes inherit it and other processes receive it when they start. The timings of every epoch (and the hits and misses of the decode cache of every process) are added to the profiler of the current process in the order of the epochs.
+
+    Args:
+        corpus: Corpus containing the tagged sentences.
+        epochs: Integer representing the number of epochs.
+        seed: Integer to initialize the seed sequence. By default, **seed** is None indicating that no random seed is given.
+        workers: Integer representing the number of processes. If it equals 1, the epochs run in the current process.
+        size: Float representing the size of the training data.
+        log_space: Boolean indicating whether the Viterbi algorithm scores sequences in log space.
+        batch_size: Integer representing the maximal number of test sentences decoded at once.
+        strata_num: Integer representing the number of strata to split the sentences stratified by their length (see `get_length_strata`). By default, **strata_num** is None indicating no stratification.
+        cache_mb: Float representing the size cap of the decode cache of every process in megabytes (see `DecodeCache`). By default, **cache_mb** is None indicating no cache.
+
+    Returns:
+        List with a tuple of four floats (see `hmm_and_viterbi_algorithm`) for every epoch in the order of the epochs.
+    '''
+    seed_seq = np.random.SeedSequence(seed)
+    print(f"Seed: {seed_seq.entropy}")
+    profiler.start_record("splits")
+    with profiler.phase("split"):
+        strata = get_length_strata(corpus.lengths,strata_num) if strata_num else None
+        permutations,split_num = get_epoch_splits(len(corpus),seed_seq.spawn(epochs),size,strata)
+    epoch_args = (range(epochs),[epochs]*epochs,permutations,[split_num]*epochs,[log_space]*epochs,[batch_size]*epochs)
+    init_worker(corpus,cache_mb)
+    if workers == 1:
+        epoch_results = list(map(run_epoch_profiled,*epoch_args))
+    else:
+        if "fork" in multiprocessing.get_all_start_methods():
+            executor = ProcessPoolExecutor(workers,mp_context=multiprocessing.get_context("fork"))
         else:
-            for n in range(len(optimal_seq[1:])):
-                if optimal_seq[n+1] == actual_seq[n]:
-                    tokens_correctly_predicted += 1
-    #Calculate the amount of correctly predicted sentences and (word or morph) tokens normalized by the number of predictable elements (sentences and/or tokens), and return both values.
-    sent_pred_accuracy = sentences_correctly_predicted/len(test_sentences)
-    tok_pred_accuracy = tokens_correctly_predicted/len(reduce_dim(test_sentences))
-    oov = oov/len(reduce_dim(test_sentences))
-    return sent_pred_accuracy,tok_pred_accuracy,oov
+            executor = ProcessPoolExecutor(workers,initializer=init_worker,initargs=(corpus,cache_mb))
+        with executor:
+            epoch_results = list(executor.map(run_epoch_profiled,*epoch_args))
+    profiler.records.extend([record for results,record in epoch_results])
+    return [results for results,record in epoch_results]
 
-#START OPERATIONS#
+def get_folds(sents_num:int,k:int,seed:int|None=None) -> list[np.ndarray]:
+    '''Randomly splits the indices of sentences into k folds.
+
+    Args:
+        sents_num: Integer representing the number of sentences.
+        k: Integer representing the number of folds.
+        seed: Integer used as the seed. By default, **seed** is None indicating that no random seed is given.
+
+    Returns:
+        List with **k** disjoint NumPy arrays of sentence indices, whose sizes differ by at most one.
+    '''
+    return np.array_split(np.random.default_rng(seed).permutation(sents_num),k)
+
+def run_k_fold(corpus:Corpus,k:int,seed:int|None=None,log_space:bool=False,batch_size:int=64,cache:DecodeCache|None=None) -> list[tuple[float,float,float,float]]:
+    '''Runs a k-fold cross-validation.
+
+    Randomly splits the sentences of **corpus** into **k** folds (see `get_folds`) and tests a tagger on every fold, which is trained on the other folds. The counts of every fold are computed once (see `get_corpus_counts`) and summed up to the counts of the whole corpus. The counts of the token-tag-pairs stay sparse, so only the small matrices with the counts of the bigrams of tags are dense. The counts of the training data of a fold are the total counts minus the counts of the fold, so the corpus is counted only once instead of **k** times (see `build_hmm_counts`).
+
+    Args:
+        corpus: Corpus containing the tagged sentences.
+        k: Integer representing the number of folds.
+        seed: Integer used to split the sentences into folds. By default, **seed** is None indicating that no random seed is given.
+        log_space: Boolean indicating whether the Viterbi algorithm scores sequences in log space.
+        batch_size: Integer representing the maximal number of test sentences decoded at once.
+        cache: Decode cache (see `viterbi_algorithm_cached`). By default, **cache** is None indicating that every sentence is decoded.
+
+    Returns:
+        List with a tuple of four floats (see `hmm_and_viterbi_algorithm`) for every fold.
+    '''
+    profiler.start_record("folds")
+    with profiler.phase("split"):
+        folds = get_folds(len(corpus),k,seed)
+    fold_counts = [get_corpus_counts(corpus,fold) for fold in folds]
+    #Sparse counts of the token-tag-pairs of the whole corpus: the pairs of all folds and the sum of their counts.
+    total_pairs = np.unique(np.concatenate([pairs for (pairs,counts),trans_counts in fold_counts]))
+    total_counts = np.zeros(len(total_pairs),dtype=np.int64)
+    for (pairs,counts),trans_counts in fold_counts:
+        total_counts = add_pair_counts(total_pairs,total_counts,pairs,counts)
+    total_trans_counts = sum([trans_counts for emis_counts,trans_counts in fold_counts])
+    results = []
+    for n,(fold,((pairs,counts),trans_counts)) in enumerate(zip(folds,fold_counts)):
+        print(f"Fold: {n+1}/{k}")
+        profiler.start_record(f"fold {n+1}")
+        train_counts = add_pair_counts(total_pairs,total_counts,pairs,counts,-1)
+        model,type_map,tag_map = build_hmm_counts(corpus,(total_pairs,train_counts),total_trans_counts-trans_counts)
+        results.append(test_hmm_corpus(model,type_map,tag_map,corpus,fold,log_space,batch_size,cache))
+    return results
+
+def get_stats(results:list[tuple[float,float,float,float]]) -> dict[str,dict]:
+    '''Calculates statistics of the test results.
+
+    The statistical model used to evaluate the performace of the tagger:
+    (1) "values": Accuracy for correctly tagged i) sentences and ii) tokens, the number of out-of-vocabulary tokens, or the number of sentences lost to underflow.
+    (2): "mean": Mean of all prediction accuracies.
+    (3): "sd": Standard deviation of the mean.
+    (4): "max" and "min": Highest and lowest value.
+
+    Args:
+        results: List with a tuple of four floats (see `hmm_and_viterbi_algorithm`) for every epoch or fold.
+
+    Returns:
+        Dictionary with the keys *sentence*, *token*, *oov* and *underflow*. Every value is a dictionary with the keys *values*, *mean*, *sd*, *max* and *min*.
+    '''
+    stats = {}
+    for key,values in zip(("sentence","token","oov","underflow"),zip(*results)):
+        values = list(values)
+        #Mean.
+        mean = sum(values)/len(values)
+        squared = [(n - mean) ** 2 for n in values]
+        ss = sum(squared)
+        variance = ss/(len(values)-1) if len(values) > 1 else 0
+        #Standard deviation.
+        sd = variance ** (1/2)
+        stats[key] = {"values": values,
+                      "mean": mean,
+                      "sd": sd,
+                      "max": max(values),
+                      "min": min(values)}
+    return stats
+
+def write_stats(file_path:str,dataset:str,stats:dict[str,dict],time_real:float):
+    '''Appends statistics to a results file.
+
+    Appends a line with the statistics **stats** (see `get_stats`) of **dataset** in percent and the running time **time_real** to the .csv-file **file_path** in the layout of *results/accuracy_and_time.csv*. The header is written, if the file does not exist yet.
+
+    Args:
+        file_path: Path to the .csv-file.
+        dataset: Name of the dataset.
+        stats: Dictionary with the statistics.
+        time_real: Float representing the running time in seconds.
+    '''
+    header = ["dataset"]
+    line = [dataset]
+    for key,name in (("sentence","sent"),("token","tok"),("oov","oov")):
+        header.extend([f"{name}_acc" if name != "oov" else name,f"{name}_sd",f"{name}_max",f"{name}_min"])
+        line.extend([f"{stats[key][measure]*100:.2f}" for measure in ("mean","sd","max","min")])
+    header.append("time_real_sec")
+    line.append(f"{time_real:.2f}")
+    new_file = not os.path.exists(file_path)
+    with open(file_path,"a",encoding="utf-8") as file:
+        if new_file:
+            file.write(";".join(header)+"\n")
+        file.write(";".join(line)+"\n")
+
+def parse_args(args:list[str]|None=None) -> argparse.Namespace:
+    '''Parses the command line arguments of `main`.
 
-#Path to preprocessed data.
-data_path = "../../data/preprocessed/"
-#File to be processed.
-dataset = "brown_words.txt"
-
-#Get token-tag-pairs from the respective file as tuples inside a list.
-print(f"Loading dataset: {dataset}")
-tagged_tokens = get_csv_as_list(data_path+dataset,"\t")
-
-#First, append token-tag-pairs to lists, which represent sentences. Second, append every list to one main list.
-tagged_sentences = get_sent_from_wd_tag_pairs(tagged_tokens,"<E>","<E>")
-
-#Training parameters: Number of training and test iterations.
-epochs = 100
-
-#The statistical model used to evaluate the performace of the tagger:
-#(1) "values": Accuracy for correctly tagged i) sentences and ii) tokens,
-#or the number of out-of-vocabulary tokens.
-#number of tokens in the test data.
-#(2): "mean": Mean of all prediction accuracies.
-#(3): "sd": Standard deviation of the mean.
-stats = {
-    "sentence": {"values":[],
-                 "mean":0,
-                 "sd":0,
-                 "max":0,
-                 "min":0},
-    "token": {"values":[],
-              "mean":0,
-              "sd":0,
-              "max":0,
-              "min":0},
-    "oov": {"values":[],
-            "mean":0,
-            "sd":0,
-            "max":0,
-            "min":0}
-}
-
-for i in range(epochs):
-    print(f"Epoch: {i+1}/{epochs}")
-
-    #Create the training and test data randomly (optionally with a seed) by default in the ration 80:20 (train:test) from the list of tagged sentences.
-    train_sentences,test_sentences = split_train_test(tagged_sentences)#,seed=469283984701)
-    #Default seed I chose for comparing results: 469283984701
+    Args:
+        args: List of strings representing the arguments. By default, **args** is None and the arguments of the command line are used.
+
+    Returns:
+        Namespace with the parsed arguments.
+    '''
+    parser = argparse.ArgumentParser(description="Train and test an HMM POS-tagger on a preprocessed dataset for several epochs (random splits) or with a k-fold cross-validation.")
+    parser.add_argument("dataset",nargs="?",default="../../data/preprocessed/brown_words.txt",help="path to a preprocessed dataset with one token-tag-pair per line (default: %(default)s)")
+    parser.add_argument("--separator",default=None,help="delimiter between token and tag (default: detected from the file, a tab or ';')")
+    parser.add_argument("--epochs",type=int,default=100,help="number of training and test iterations (default: %(default)s)")
+    parser.add_argument("--train-ratio",type=float,default=0.8,help="size of the training data in every epoch (default: %(default)s)")
+    parser.add_argument("--strata",type=int,default=None,help="split every epoch stratified by sentence length into this number of length groups")
+    parser.add_argument("--folds",type=int,default=None,help="number of folds for a k-fold cross-validation instead of the epochs")
+    parser.add_argument("--seed",type=int,default=None,help="seed to split the data (default: random seed; the seed chosen for comparing results is 469283984701)")
+    parser.add_argument("--workers",type=int,default=1,help="number of processes running epochs in parallel (default: %(default)s)")
+    parser.add_argument("--log-space",action="store_true",help="score sequences with log probabilities (no underflow) instead of probabilities")
+    parser.add_argument("--batch-size",type=int,default=64,help="maximal number of test sentences decoded at once (default: %(default)s)")
+    parser.add_argument("--cache-mb",type=float,default=None,help="cache decoded sentences per model in an LRU cache of this size in megabytes (per process)")
+    parser.add_argument("--results",default=None,help="path of a .csv-file to append the statistics to")
+    parser.add_argument("--timings",default=None,help="path of a .csv- or .json-file to save the time of every phase per epoch to")
+    parser.add_argument("--profile-memory",action="store_true",help="trace the memory allocated in every phase and the live paths in the decoder (slow; the epochs run in one process)")
+    parser.add_argument("--model",default=None,help="path of a .npz-file to save an HMM trained on the whole dataset to")
+    return parser.parse_args(args)
+
+def main(args:list[str]|None=None):
+    '''Runs the tagger from the command line (see `parse_args`).
+
+    Args:
+        args: List of strings representing the arguments. By default, **args** is None and the arguments of the command line are used.
+    '''
+    args = parse_args(args)
+    dataset = os.path.basename(args.dataset)
+    separator = args.separator or detect_separator(args.dataset)
+
+    #Stream the token-tag-pairs from the respective file and encode its sentences compactly.
+    #The running time includes loading the dataset.
+    start_time = time.perf_counter()
+    if args.profile_memory:
+        profiler.start_memory()
+    print(f"Loading dataset: {dataset}")
+    profiler.start_record("load")
+    with profiler.phase("load"):
+        corpus = Corpus.from_file(args.dataset,separator)
 
+    #Create the training and test data randomly (optionally with a seed) by default in the ration 80:20 (train:test) from the tagged sentences for every epoch,
+    #or split the tagged sentences into k folds for a k-fold cross-validation.
     #Train an HMM and test it using the Viterbi algorithm. Save the test results.
-    sent_pred,tok_pred,oov = hmm_and_viterbi_algorithm(train_sentences,test_sentences)
-    stats["sentence"]["values"].append(sent_pred)
-    stats["token"]["values"].append(tok_pred)
-    stats["oov"]["values"].append(oov)
-
-#Calculate statistics.
-for key,val in stats.items():
-    values = val["values"]
-    #Mean.
-    mean = sum(values)/len(values)
-    squared = [(n - mean) ** 2 for n in values]
-    ss = sum(squared)
-    variance = ss/(len(values)-1)
-    #Standard deviation.
-    sd = variance ** (1/2)
-    #Highest and lowest value.
-    val["max"] = max(values)
-    val["min"] = min(values)
-    #Save statistics.
-    val["mean"] = mean
-    val["sd"] = sd
-
-#Print the results to the terminal.
-print(f"\nSentence predition accuracy: {round(stats['sentence']['mean']*100,2)}%. SD: {round(stats['sentence']['sd']*100,2)}. Max: {round(stats['sentence']['max']*100,2)}%. Min {round(stats['sentence']['min']*100,2)}%.")
-print(f"Token prediction accuracy: {round(stats['token']['mean']*100,2)}%. SD: {round(stats['token']['sd']*100,2)}. Max: {round(stats['token']['max']*100,2)}%. Min {round(stats['token']['min']*100,2)}%.")
-print(f"Out-of-vocabulary tokens per epoch: {round(stats['oov']['mean']*100,2)}%. SD: {round(stats['oov']['sd']*100,2)}. Max: {round(stats['oov']['max']*100,2)}%. Min {round(stats['oov']['min']*100,2)}%.")
+    if args.folds:
+        cache = DecodeCache(args.cache_mb) if args.cache_mb else None
+        results = run_k_fold(corpus,args.folds,args.seed,args.log_space,args.batch_size,cache)
+    else:
+        #The memory is only traced in the current process.
+        workers = 1 if args.profile_memory else args.workers
+        results = run_epochs(corpus,args.epochs,args.seed,workers,args.train_ratio,args.log_space,args.batch_size,args.strata,args.cache_mb)
+    time_real = time.perf_counter()-start_time
+
+    #Calculate statistics.
+    stats = get_stats(results)
+    #Print the results to the terminal.
+    print(f"\nSentence predition accuracy: {round(stats['sentence']['mean']*100,2)}%. SD: {round(stats['sentence']['sd']*100,2)}. Max: {round(stats['sentence']['max']*100,2)}%. Min {round(stats['sentence']['min']*100,2)}%.")
+    print(f"Token prediction accuracy: {round(stats['token']['mean']*100,2)}%. SD: {round(stats['token']['sd']*100,2)}. Max: {round(stats['token']['max']*100,2)}%. Min {round(stats['token']['min']*100,2)}%.")
+    print(f"Out-of-vocabulary tokens per epoch: {round(stats['oov']['mean']*100,2)}%. SD: {round(stats['oov']['sd']*100,2)}. Max: {round(stats['oov']['max']*100,2)}%. Min {round(stats['oov']['min']*100,2)}%.")
+    print(f"Sentences lost to underflow per epoch: {round(stats['underflow']['mean']*100,2)}%. SD: {round(stats['underflow']['sd']*100,2)}. Max: {round(stats['underflow']['max']*100,2)}%. Min {round(stats['underflow']['min']*100,2)}%.")
+
+    if args.cache_mb:
+        if args.folds:
+            hits,misses = cache.hits,cache.misses
+        else:
+            hits = sum([record["cache"]["hits"] for record in profiler.records if "cache" in record])
+            misses = sum([record["cache"]["misses"] for record in profiler.records if "cache" in record])
+        print(f"Decode cache: {hits} hits, {misses} misses.")
+
+    if args.profile_memory:
+        print(f"\nMemory:\n{profiler.get_memory_report()}")
+
+    #Append the results to the results file.
+    if args.results:
+        print(f"Saving results: {args.results}")
+        write_stats(args.results,dataset,stats,time_real)
+    if args.timings:
+        print(f"Saving timings: {args.timings}")
+        profiler.write(args.timings)
+
+    #Train an HMM on the whole dataset and save it for tagging new data.
+    if args.model:
+        print(f"Saving model: {args.model}")
+        save_model(train_hmm_corpus(corpus,np.arange(len(corpus)))[0],args.model)
+
+#START OPERATIONS#
+
+if __name__ == "__main__":
+    main()
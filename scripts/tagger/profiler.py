@@ -0,0 +1,148 @@
+#Script written by Aleksandr Schamberger (GitHub: https://github.com/a-leks-icon) as part of the introductory course by Roland Meyer 'Einführung in die Computerlinguistik (mit Anwendung auf Slawische Sprachen)' at the Humboldt Universität zu Berlin in the winter semester 2023/24.
+
+#Measuring the time spent in every phase of pos_tagger.py (loading, splitting, training and testing) per epoch
+#and optionally the memory allocated in every phase and the number of live paths in the decoder.
+
+import json
+import time
+import tracemalloc
+import numpy as np
+from contextlib import contextmanager
+
+class PhaseProfiler:
+    '''Records the time spent in phases of the tagger.
+
+    The time of a phase is measured with `time.perf_counter_ns` and added to the current record. A record is started for every part of a run (e.g. loading the dataset or an epoch), so the records show which phase takes the most time in every epoch.
+
+    In memory mode (see `start_memory`), tracemalloc takes a snapshot at the start and the end of every phase. The record gets the traced memory at the end of the phase, the peak during the phase and the allocation sites, whose memory grew the most between both snapshots. In addition, the decoder reports the number of live paths (tags with a probability greater than 0) at every token position (see `count_live_paths`). Both together show whether the memory is taken by the probability tables or by the paths.
+
+    Attributes:
+        PHASES: Tuple with the names of the phases.
+        records: List with a dictionary for every record. Every dictionary maps *name* to the name of the record and every phase to its time in nanoseconds. In memory mode, *memory* maps every phase to a dictionary with its traced memory in bytes (*current*, *peak*) and its top allocation sites (*top*).
+        memory: Boolean indicating whether memory mode is on.
+        top: Integer representing the number of allocation sites kept per phase.
+        live_paths: Dictionary with three NumPy arrays indexed by the token position: *sents* (number of decoded sentences with a token at the position), *total* (sum of their live paths) and *max* (highest number of live paths).
+    '''
+
+    PHASES = ("load","split","emission","transition","decode","scoring")
+
+    def __init__(self):
+        self.records = []
+        self.memory = False
+        self.top = 10
+        self.live_paths = {key:np.zeros(0,dtype=np.int64) for key in ("sents","total","max")}
+
+    def start_record(self,name:str):
+        '''Starts a new record **name**, to which the time of the following phases is added.'''
+        self.records.append({"name": name} | {phase:0 for phase in self.PHASES})
+        if self.memory:
+            self.records[-1]["memory"] = {}
+
+    def start_memory(self,top:int=10,frames:int=1):
+        '''Turns on memory mode and starts tracing allocations.
+
+        Args:
+            top: Integer representing the number of allocation sites kept per phase.
+            frames: Integer representing the number of frames stored per allocation (see `tracemalloc.start`).
+        '''
+        self.memory = True
+        self.top = top
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        for record in self.records:
+            record.setdefault("memory",{})
+
+    @contextmanager
+    def phase(self,phase:str):
+        '''Measures the time of the code inside a with-statement and adds it to **phase** of the current record.
+
+        Args:
+            phase: String representing the name of a phase (see **PHASES**).
+        '''
+        if not self.records:
+            self.start_record("")
+        if self.memory:
+            start_snapshot = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.records[-1][phase] += time.perf_counter_ns()-start
+            if self.memory:
+                self.add_memory(phase,start_snapshot)
+
+    def add_memory(self,phase:str,start_snapshot:tracemalloc.Snapshot):
+        '''Adds the traced memory and the top allocation sites of **phase** since **start_snapshot** to the current record.'''
+        current,peak = tracemalloc.get_traced_memory()
+        #Leave out the allocations of tracemalloc and of the profiler itself.
+        filters = [tracemalloc.Filter(False,tracemalloc.__file__),tracemalloc.Filter(False,__file__)]
+        end_snapshot = tracemalloc.take_snapshot().filter_traces(filters)
+        stats = end_snapshot.compare_to(start_snapshot.filter_traces(filters),"lineno")
+        top = [{"site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                "size_diff": stat.size_diff,
+                "count_diff": stat.count_diff,
+                "size": stat.size} for stat in stats[:self.top]]
+        memory = self.records[-1]["memory"]
+        if phase in memory:
+            #Phases running several times in a record keep their highest values and the top sites of their last run.
+            current = max(current,memory[phase]["current"])
+            peak = max(peak,memory[phase]["peak"])
+        memory[phase] = {"current": current,"peak": peak,"top": top}
+
+    def count_live_paths(self,position:int,live_paths:np.ndarray):
+        '''Adds the number of live paths **live_paths** of sentences at the token position **position** (see **live_paths**).'''
+        if position >= len(self.live_paths["sents"]):
+            for key,values in self.live_paths.items():
+                self.live_paths[key] = np.concatenate([values,np.zeros(position+1-len(values),dtype=np.int64)])
+        self.live_paths["sents"][position] += len(live_paths)
+        self.live_paths["total"][position] += int(np.sum(live_paths))
+        self.live_paths["max"][position] = max(self.live_paths["max"][position],int(np.max(live_paths,initial=0)))
+
+    def get_totals(self) -> dict[str,int]:
+        '''Returns a dictionary mapping every phase to its time in nanoseconds summed over all records.'''
+        return {phase:sum([record[phase] for record in self.records]) for phase in self.PHASES}
+
+    def get_memory_report(self) -> str:
+        '''Returns a summary of memory mode as a string: the highest peak of every phase with its top allocation sites and the mean and maximal number of live paths per token position.'''
+        lines = []
+        for phase in self.PHASES:
+            memories = [record["memory"][phase] for record in self.records if phase in record.get("memory",{})]
+            if not memories:
+                continue
+            memory = max(memories,key=lambda memory: memory["peak"])
+            lines.append(f"Phase {phase}: peak {memory['peak']/2**20:.2f} MiB, current {memory['current']/2**20:.2f} MiB.")
+            for site in memory["top"]:
+                lines.append(f"    {site['site']}: {site['size_diff']/1024:+.1f} KiB ({site['count_diff']:+d} blocks).")
+        sents = self.live_paths["sents"]
+        if len(sents):
+            lines.append("Live paths per token position (position: mean, max):")
+            for position in np.flatnonzero(sents):
+                lines.append(f"    {position}: {self.live_paths['total'][position]/sents[position]:.2f}, {self.live_paths['max'][position]}")
+        return "\n".join(lines)
+
+    def write(self,file_path:str):
+        '''Writes the records.
+
+        Writes the records in seconds to **file_path**: as a JSON-file, if **file_path** ends with *.json*, together with the total time of every phase (and in memory mode the memory of every record and the live paths per token position), or else as a .csv-file with one line per record and one column per phase (separated by ";" like the other results).
+
+        Args:
+            file_path: Path to the .json- or .csv-file.
+        '''
+        records = [{"name": record["name"]} | {phase:record[phase]/1e9 for phase in self.PHASES} for record in self.records]
+        with open(file_path,"w",encoding="utf-8") as file:
+            if file_path.endswith(".json"):
+                totals = {phase:total/1e9 for phase,total in self.get_totals().items()}
+                content = {"unit": "s","records": records,"totals": totals}
+                if self.memory:
+                    for record,timed_record in zip(self.records,records):
+                        timed_record["memory"] = record.get("memory",{})
+                    content["live_paths"] = {key:values.tolist() for key,values in self.live_paths.items()}
+                json.dump(content,file,ensure_ascii=False,indent=2)
+            else:
+                file.write(";".join(("name",)+self.PHASES)+"\n")
+                for record in records:
+                    file.write(";".join([record["name"]]+[f"{record[phase]:.6f}" for phase in self.PHASES])+"\n")
+
+#Profiler used by pos_tagger.py.
+profiler = PhaseProfiler()
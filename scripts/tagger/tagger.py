@@ -0,0 +1,148 @@
+#Script written by Aleksandr Schamberger (GitHub: https://github.com/a-leks-icon) as part of the introductory course by Roland Meyer 'Einführung in die Computerlinguistik (mit Anwendung auf Slawische Sprachen)' at the Humboldt Universität zu Berlin in the winter semester 2023/24.
+
+#Tagging new (untagged) data with an HMM trained by pos_tagger.py.
+
+import argparse
+import numpy as np
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from corpus import Corpus
+from decode_cache import DecodeCache
+from hmm_model import load_model
+from pos_tagger import train_hmm_corpus, viterbi_algorithm_batch
+
+class Tagger:
+    '''POS-tagger based on a trained HMM.
+
+    Tags sentences of (word or morph) tokens with the Viterbi algorithm (see `viterbi_algorithm_batch`) given a trained model (see `train_hmm`). Sentences without a sequence with a probability greater than 0 are decoded again in log space. If no sequence exists in log space either, every token gets the most frequently occuring tag.
+
+    Attributes:
+        model: Dictionary representing a trained HMM (see `train_hmm`).
+        tags: List of (POS) tags. The index of a tag is its index in the model.
+        log_space: Boolean indicating whether to score sequences in log space right away.
+        batch_size: Integer representing the maximal number of sentences decoded at once.
+        cache: Decode cache (see `DecodeCache`) or None.
+    '''
+
+    def __init__(self,model:dict,log_space:bool=False,batch_size:int=64,cache:DecodeCache|None=None):
+        '''Creates a tagger using the trained **model**.
+
+        Args:
+            model: Dictionary representing a trained HMM (see `train_hmm`).
+            log_space: Boolean indicating whether to score sequences in log space right away.
+            batch_size: Integer representing the maximal number of sentences decoded at once.
+            cache: Decode cache. By default, **cache** is None indicating that every sentence is decoded.
+        '''
+        self.model = model
+        self.tags = list(model["tags_ind"])
+        self.log_space = log_space
+        self.batch_size = batch_size
+        self.cache = cache
+
+    @classmethod
+    def from_file(cls,file_path:str,mmap:bool=True,**kwargs):
+        '''Creates a tagger using a model saved with `save_model` in the .npz-file **file_path** (see `load_model`). Further keyword arguments are passed on to the tagger.'''
+        return cls(load_model(file_path,mmap),**kwargs)
+
+    @classmethod
+    def from_sentences(cls,tagged_sentences:Iterable[list[tuple[str,str]]],**kwargs):
+        '''Creates a tagger using a model trained on **tagged_sentences** (lists of token-tag-pairs, see `train_hmm_corpus`). Further keyword arguments are passed on to the tagger.'''
+        corpus = tagged_sentences if isinstance(tagged_sentences,Corpus) else Corpus(tagged_sentences)
+        return cls(train_hmm_corpus(corpus,np.arange(len(corpus)))[0],**kwargs)
+
+    def decode(self,sents_ids:list[np.ndarray]) -> list[list[int]]:
+        '''Returns the indices of the predicted tags of several encoded sentences **sents_ids** (see `viterbi_algorithm_batch`).'''
+        optimal_seqs = viterbi_algorithm_batch(sents_ids,self.model,self.log_space,self.batch_size,self.cache)
+        lost = [ind for ind,optimal_seq in enumerate(optimal_seqs) if optimal_seq is None]
+        if lost and not self.log_space:
+            #Sentences, whose probabilities underflowed to 0.
+            for ind,optimal_seq in zip(lost,viterbi_algorithm_batch([sents_ids[ind] for ind in lost],self.model,True,self.batch_size,self.cache)):
+                optimal_seqs[ind] = optimal_seq
+        most_frequent_tag = int(self.model["most_frequent_tag"])
+        return [[most_frequent_tag]*len(sent_ids) if optimal_seq is None else optimal_seq for sent_ids,optimal_seq in zip(sents_ids,optimal_seqs)]
+
+    def tag(self,tokens:list[str]) -> list[str]:
+        '''Tags a sentence.
+
+        Args:
+            tokens: List of strings representing the (word or morph) tokens of a sentence.
+
+        Returns:
+            List with the predicted (POS) tag of every token.
+        '''
+        return next(self.tag_many([tokens]))
+
+    def tag_many(self,sentences:Iterable[list[str]]) -> Iterator[list[str]]:
+        '''Tags several sentences.
+
+        Takes **batch_size** sentences at a time from **sentences** and decodes them at once, so **sentences** may be a stream of any length.
+
+        Args:
+            sentences: Iterable of lists of strings representing the (word or morph) tokens of sentences.
+
+        Yields:
+            List with the predicted (POS) tag of every token of a sentence in the order of **sentences**.
+        '''
+        sentences = iter(sentences)
+        vocabulary = self.model["vocabulary"]
+        while batch := list(islice(sentences,self.batch_size)):
+            for tag_inds in self.decode(vocabulary.encode_many(batch)):
+                yield [self.tags[tag_ind] for tag_ind in tag_inds]
+
+    def tag_file(self,input_path:str,output_path:str,sent_end:str="<E>") -> Iterator[list[tuple[str,str]]]:
+        '''Tags a file with one token per line.
+
+        Streams the tokens of the file **input_path**, in which an empty line or a line with **sent_end** ends a sentence, and writes every token and its predicted tag as *token<TAB>tag* to the file **output_path**. Sentences are separated by an empty line. The output is flushed after every sentence, so only one batch of sentences (see `tag_many`) is kept in memory.
+
+        Args:
+            input_path: Path to the file with the tokens.
+            output_path: Path to the file with the tagged tokens.
+            sent_end: String marking the end of a sentence in addition to an empty line.
+
+        Yields:
+            List with the token-tag-pairs of a sentence after it is written.
+        '''
+        with open(output_path,"w",encoding="utf-8") as output:
+            sentences = iter_token_sentences(input_path,sent_end)
+            #Tag the sentences in batches, but write and flush every sentence on its own.
+            while batch := list(islice(sentences,self.batch_size)):
+                for tokens,tags in zip(batch,self.tag_many(batch)):
+                    output.write("".join([f"{token}\t{tag}\n" for token,tag in zip(tokens,tags)])+"\n")
+                    output.flush()
+                    yield list(zip(tokens,tags))
+
+def iter_token_sentences(file_path:str,sent_end:str="<E>") -> Iterator[list[str]]:
+    '''Streams the sentences of a file with one token per line.
+
+    Args:
+        file_path: Path to the file.
+        sent_end: String marking the end of a sentence in addition to an empty line.
+
+    Yields:
+        List with the tokens of a sentence.
+    '''
+    sent = []
+    with open(file_path,encoding="utf-8") as file:
+        for line in file:
+            token = line.strip()
+            if token and token != sent_end:
+                sent.append(token)
+            elif sent:
+                yield sent
+                sent = []
+    if sent:
+        yield sent
+
+#START OPERATIONS#
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tag a file with one (word or morph) token per line using a model saved by pos_tagger.py.")
+    parser.add_argument("model",help="path to the .npz-file of the model")
+    parser.add_argument("input",help="path to the file with one token per line (sentences end with an empty line or <E>)")
+    parser.add_argument("output",help="path to the file to write token<TAB>tag per line to")
+    parser.add_argument("--log-space",action="store_true",help="score sequences with log probabilities right away")
+    parser.add_argument("--batch-size",type=int,default=64,help="maximal number of sentences decoded at once (default: %(default)s)")
+    args = parser.parse_args()
+    tagger = Tagger.from_file(args.model,log_space=args.log_space,batch_size=args.batch_size)
+    sents_num = sum([1 for tagged_sent in tagger.tag_file(args.input,args.output)])
+    print(f"Tagged {sents_num} sentences: {args.output}")
@@ -0,0 +1,188 @@
+#Script written by Aleksandr Schamberger (GitHub: https://github.com/a-leks-icon) as part of the introductory course by Roland Meyer 'Einführung in die Computerlinguistik (mit Anwendung auf Slawische Sprachen)' at the Humboldt Universität zu Berlin in the winter semester 2023/24.
+
+#Serving a trained HMM (see tagger.py) over HTTP with the standard library only:
+#POST /tag takes a JSON batch of sentences, GET /metrics reports the latency and throughput of the server.
+#Concurrent requests arriving within a short window are decoded together in one batch.
+
+import argparse
+import asyncio
+import json
+import time
+import numpy as np
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from decode_cache import DecodeCache
+from tagger import Tagger
+
+class TaggerServer:
+    '''HTTP server tagging batches of sentences.
+
+    Every request to *POST /tag* sends a JSON object with a list of sentences, each of them a list of (word or morph) tokens (e.g. `{"sentences": [["bu","halh"]]}`), and gets a JSON object with the list of predicted tags of every sentence (e.g. `{"tags": [["PN","N"]]}`). Requests are not decoded one by one: the first request starts a window of **window_ms** milliseconds and all requests arriving within it are decoded together (see `Tagger.tag_many`). A batch is decoded at once, if it has **max_batch** sentences. Decoding runs in a single worker thread, so the server keeps accepting requests meanwhile.
+
+    *GET /metrics* returns the number of requests, sentences, tokens and decoded batches, the median (p50) and 99th percentile (p99) of the latency of the last **latencies** requests in milliseconds and the throughput in requests, sentences and tokens per second since the start.
+
+    Attributes:
+        tagger: Tagger used to tag the sentences (see `Tagger`).
+        window: Float representing the window in seconds.
+        max_batch: Integer representing the number of sentences decoded at once without waiting for the end of the window.
+        pending: List with the sentences and the future of every request waiting to be decoded.
+        pending_sents: Integer representing the number of sentences in **pending**.
+        flush_task: Task decoding **pending** at the end of the current window (or None, if no request is pending).
+        latencies: Deque with the latency of the most recent requests in seconds.
+        counts: Dictionary mapping *requests*, *sentences*, *tokens*, *batches* and *errors* to their numbers since the start.
+    '''
+
+    def __init__(self,tagger:Tagger,window_ms:float=5,max_batch:int=256,latencies:int=10000):
+        '''Creates a server for **tagger** (see the attributes).'''
+        self.tagger = tagger
+        self.window = window_ms/1000
+        self.max_batch = max_batch
+        self.pending = []
+        self.pending_sents = 0
+        self.flush_task = None
+        self.latencies = deque(maxlen=latencies)
+        self.counts = {"requests": 0,"sentences": 0,"tokens": 0,"batches": 0,"errors": 0}
+        self.start_time = time.perf_counter()
+        self.executor = ThreadPoolExecutor(1)
+
+    async def tag(self,sentences:list[list[str]]) -> list[list[str]]:
+        '''Adds the sentences of a request to the pending batch and returns their tags once the batch is decoded.'''
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((sentences,future))
+        self.pending_sents += len(sentences)
+        if self.pending_sents >= self.max_batch:
+            if self.flush_task is not None:
+                self.flush_task.cancel()
+                self.flush_task = None
+            self.flush()
+        elif self.flush_task is None:
+            self.flush_task = asyncio.create_task(self.flush_later())
+        return await future
+
+    async def flush_later(self):
+        '''Decodes the pending batch at the end of the window.'''
+        await asyncio.sleep(self.window)
+        self.flush_task = None
+        self.flush()
+
+    def flush(self):
+        '''Decodes the pending batch in the worker thread and passes the tags of every request on to its future.'''
+        pending,self.pending,self.pending_sents = self.pending,[],0
+        sentences = [sent for sents,future in pending for sent in sents]
+        self.counts["batches"] += 1
+        decoding = asyncio.get_running_loop().run_in_executor(self.executor,lambda: list(self.tagger.tag_many(sentences)))
+        decoding.add_done_callback(lambda decoding: self.resolve(pending,decoding))
+
+    @staticmethod
+    def resolve(pending:list,decoding:asyncio.Future):
+        '''Passes the tags of the decoded batch **decoding** (or its exception) on to the futures of the requests in **pending**.'''
+        if decoding.exception() is not None:
+            for sents,future in pending:
+                if not future.done():
+                    future.set_exception(decoding.exception())
+            return
+        tags = decoding.result()
+        start = 0
+        for sents,future in pending:
+            if not future.done():
+                future.set_result(tags[start:start+len(sents)])
+            start += len(sents)
+
+    def get_metrics(self) -> dict:
+        '''Returns the metrics of the server (see *GET /metrics*).'''
+        elapsed = time.perf_counter()-self.start_time
+        latencies = np.array(self.latencies)*1000
+        p50,p99 = np.percentile(latencies,[50,99]).tolist() if len(latencies) else (None,None)
+        return self.counts | {"uptime_sec": elapsed,
+                              "latency_ms": {"p50": p50,"p99": p99,"window": len(latencies)},
+                              "throughput": {f"{key}_per_sec":self.counts[key]/elapsed for key in ("requests","sentences","tokens")}}
+
+    async def handle_request(self,method:str,path:str,body:bytes) -> tuple[HTTPStatus,dict]:
+        '''Returns the status and the JSON object of the response to a request.'''
+        if path == "/metrics":
+            if method != "GET":
+                return HTTPStatus.METHOD_NOT_ALLOWED,{"error": "Use GET for /metrics."}
+            return HTTPStatus.OK,self.get_metrics()
+        if path != "/tag":
+            return HTTPStatus.NOT_FOUND,{"error": f"Unknown path: {path}"}
+        if method != "POST":
+            return HTTPStatus.METHOD_NOT_ALLOWED,{"error": "Use POST for /tag."}
+        start = time.perf_counter()
+        try:
+            sentences = json.loads(body)["sentences"]
+            if not all(isinstance(sent,list) and all(isinstance(token,str) for token in sent) for sent in sentences):
+                raise TypeError
+        except (ValueError,KeyError,TypeError):
+            self.counts["errors"] += 1
+            return HTTPStatus.BAD_REQUEST,{"error": 'Send a JSON object like {"sentences": [["token", ...], ...]}.'}
+        #Empty sentences are not decoded.
+        tags = iter(await self.tag([sent for sent in sentences if sent]) if any(sentences) else [])
+        tags = [next(tags) if sent else [] for sent in sentences]
+        self.latencies.append(time.perf_counter()-start)
+        self.counts["requests"] += 1
+        self.counts["sentences"] += len(sentences)
+        self.counts["tokens"] += sum([len(sent) for sent in sentences])
+        return HTTPStatus.OK,{"tags": tags}
+
+    async def handle_connection(self,reader:asyncio.StreamReader,writer:asyncio.StreamWriter):
+        '''Reads HTTP/1.1 requests from a connection and writes their responses until the client closes it.'''
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method,path,version = request_line.decode("latin-1").split()
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n",b"\n",b""):
+                    name,_,value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length",0)))
+                try:
+                    status,content = await self.handle_request(method,path.split("?")[0],body)
+                except Exception as error:
+                    self.counts["errors"] += 1
+                    status,content = HTTPStatus.INTERNAL_SERVER_ERROR,{"error": repr(error)}
+                keep_alive = headers.get("connection","").lower() != "close" and version == "HTTP/1.1"
+                body = json.dumps(content,ensure_ascii=False).encode("utf-8")
+                writer.write(f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                             f"Content-Type: application/json; charset=utf-8\r\n"
+                             f"Content-Length: {len(body)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1")+body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ValueError,asyncio.IncompleteReadError,ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self,host:str="127.0.0.1",port:int=8080):
+        '''Serves requests on **host** and **port** until the server is stopped.'''
+        server = await asyncio.start_server(self.handle_connection,host,port)
+        print(f"Serving on http://{host}:{port} (POST /tag, GET /metrics).")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.executor.shutdown()
+
+#START OPERATIONS#
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a model saved by pos_tagger.py over HTTP.")
+    parser.add_argument("model",help="path to the .npz-file of the model")
+    parser.add_argument("--host",default="127.0.0.1",help="host to listen on (default: %(default)s)")
+    parser.add_argument("--port",type=int,default=8080,help="port to listen on (default: %(default)s)")
+    parser.add_argument("--window-ms",type=float,default=5,help="window in milliseconds within which requests are decoded together (default: %(default)s)")
+    parser.add_argument("--max-batch",type=int,default=256,help="number of sentences decoded without waiting for the end of the window (default: %(default)s)")
+    parser.add_argument("--log-space",action="store_true",help="score sequences with log probabilities right away")
+    parser.add_argument("--batch-size",type=int,default=64,help="maximal number of sentences decoded at once by the decoder (default: %(default)s)")
+    parser.add_argument("--cache-mb",type=float,default=None,help="size cap of a decode cache in megabytes (default: no cache)")
+    args = parser.parse_args()
+    cache = None if args.cache_mb is None else DecodeCache(args.cache_mb)
+    tagger = Tagger.from_file(args.model,log_space=args.log_space,batch_size=args.batch_size,cache=cache)
+    try:
+        asyncio.run(TaggerServer(tagger,args.window_ms,args.max_batch).serve(args.host,args.port))
+    except KeyboardInterrupt:
+        pass
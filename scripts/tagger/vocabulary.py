@@ -0,0 +1,87 @@
+#Script written by Aleksandr Schamberger (GitHub: https://github.com/a-leks-icon) as part of the introductory course by Roland Meyer 'Einführung in die Computerlinguistik (mit Anwendung auf Slawische Sprachen)' at the Humboldt Universität zu Berlin in the winter semester 2023/24.
+
+#Mapping (word or morph) types to integer ids used by pos_tagger.py and hmm_model.py.
+
+import numpy as np
+from collections.abc import Iterable
+
+class Vocabulary:
+    '''Maps (word or morph) types to integer ids.
+
+    Every type is mapped once to an integer id (in the order the types are added) through a dictionary. Tokens not in the vocabulary get the reserved id **UNK_ID**. Sentences are encoded as NumPy arrays of ids, so that every later lookup is done by indexing arrays.
+
+    Attributes:
+        UNK_ID: Integer representing the reserved id of unknown (out-of-vocabulary) tokens.
+        types: List of types. The index of a type is its id.
+        ids: Dictionary mapping every type to its id.
+    '''
+
+    UNK_ID = -1
+
+    def __init__(self,types:Iterable[str]=()):
+        '''Creates a vocabulary containing **types**.
+
+        Args:
+            types: Iterable of types. Repeated types are only added once.
+        '''
+        self.types = []
+        self.ids = {}
+        for tp in types:
+            self.add(tp)
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def __iter__(self):
+        return iter(self.types)
+
+    def __contains__(self,token:str) -> bool:
+        return token in self.ids
+
+    def add(self,tp:str) -> int:
+        '''Adds the type **tp**, if it is not in the vocabulary yet, and returns its id.
+
+        Args:
+            tp: String representing a (word or morph) type.
+
+        Returns:
+            Integer representing the id of **tp**.
+        '''
+        type_id = self.ids.setdefault(tp,len(self.types))
+        if type_id == len(self.types):
+            self.types.append(tp)
+        return type_id
+
+    def get_id(self,token:str) -> int:
+        '''Returns the id of **token** or **UNK_ID**, if it is not in the vocabulary.
+
+        Args:
+            token: String representing a (word or morph) token.
+
+        Returns:
+            Integer representing the id of **token**.
+        '''
+        return self.ids.get(token,self.UNK_ID)
+
+    def encode(self,tokens:list[str]) -> np.ndarray:
+        '''Encodes a sentence.
+
+        Args:
+            tokens: List of strings representing (word or morph) tokens.
+
+        Returns:
+            NumPy array (int32) with the id of every token in **tokens** (**UNK_ID** for unknown tokens).
+        '''
+        ids = self.ids
+        return np.fromiter([ids.get(token,self.UNK_ID) for token in tokens],dtype=np.int32,count=len(tokens))
+
+    def encode_many(self,sentences:Iterable[list[str]]) -> list[np.ndarray]:
+        '''Encodes several sentences (see `encode`).
+
+        Args:
+            sentences: Iterable of lists of strings representing (word or morph) tokens.
+
+        Returns:
+            List with a NumPy array (int32) of ids for every sentence.
+        '''
+        return [self.encode(tokens) for tokens in sentences]